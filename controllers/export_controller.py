@@ -145,7 +145,9 @@ class ExportController:
 
         self._log(f"Bắt đầu xuất {self._total_projects} project(s)")
 
-        # Khởi tạo automation service
+        # Khởi tạo automation service (đóng backend chụp của service cũ nếu có)
+        if self._automation_service:
+            self._automation_service.close()
         self._automation_service = AutomationService(
             capcut_exe_path=self.config.capcut_exe_path,
             log_callback=self._log,
@@ -262,6 +264,10 @@ class ExportController:
         self._state = ExportState.COMPLETED
         self._current_project = None
 
+        # Không còn chụp màn hình đến lần xuất sau: giải phóng mss/DXcam
+        if self._automation_service:
+            self._automation_service.close()
+
         # Tạo thông báo kết quả
         total = self._total_projects
         success = self._completed_count
@@ -8,13 +8,78 @@ Model này chứa thông tin về project bao gồm:
 """
 
 import os
+import sys
 import json
+import stat
+import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass, field
+from utils.helpers import probe_json_flag, loads_json
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# dataclass(slots=True) chỉ có từ Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Các key đánh dấu project trong thùng rác, key phổ biến nhất đứng đầu
+_TRASH_KEYS = ('draft_is_deleted', 'is_trash')
+
+# Hậu tố đường dẫn các file metadata, nối trực tiếp với thư mục project
+_DRAFT_INFO_SUFFIX = os.sep + 'draft_info.json'
+_DRAFT_CONTENT_SUFFIX = os.sep + 'draft_content.json'
+
+
+def _extract_info_fields(
+    info: Dict[str, Any],
+    default_name: str
+) -> Tuple[str, Optional[int], Optional[int], bool]:
+    """
+    Trích xuất các trường cần dùng từ nội dung draft_info.json.
+
+    Mỗi key chỉ được lookup đúng một lần, các key khác trong
+    dictionary được bỏ qua.
+
+    Args:
+        info: Dictionary đã parse từ draft_info.json
+        default_name: Tên dùng khi không có draft_name
+
+    Returns:
+        Tuple (name, created_ts_ms, modified_ts_ms, is_trash)
+    """
+    get = info.get
+
+    # Timestamp tính bằng milliseconds
+    created_ms = get('tm_draft_create')
+    modified_ms = get('tm_draft_modified')
+
+    return (
+        get('draft_name', default_name),
+        int(created_ms) if created_ms is not None else None,
+        int(modified_ms) if modified_ms is not None else None,
+        any(get(key) for key in _TRASH_KEYS)
+    )
+
+
+def _intern_keys(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Intern các key cấp đầu của metadata.
+
+    Metadata của các project CapCut dùng chung một bộ key cố định,
+    intern giúp các project chia sẻ cùng một string thay vì mỗi
+    project giữ một bản sao.
+
+    Args:
+        data: Dictionary metadata đã parse
+
+    Returns:
+        Dictionary mới với các key đã intern
+    """
+    intern = sys.intern
+    return {intern(key): value for key, value in data.items()}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Project:
     """
     Model đại diện cho một project CapCut.
@@ -23,20 +88,43 @@ class Project:
         id: ID duy nhất của project
         name: Tên project
         path: Đường dẫn đến thư mục project
-        created_date: Ngày tạo project
-        modified_date: Ngày chỉnh sửa cuối cùng
+        created_ts_ms: Thời điểm tạo project (timestamp milliseconds)
+        modified_ts_ms: Thời điểm chỉnh sửa cuối cùng (timestamp milliseconds)
         is_trash: Project có trong thùng rác hay không
     """
     id: str
     name: str
     path: str
-    created_date: Optional[datetime] = None
-    modified_date: Optional[datetime] = None
+    created_ts_ms: Optional[int] = None
+    modified_ts_ms: Optional[int] = None
     is_trash: bool = False
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def created_date(self) -> Optional[datetime]:
+        """Ngày tạo project, chỉ tạo datetime khi cần hiển thị."""
+        if self.created_ts_ms is None:
+            return None
+        return datetime.fromtimestamp(self.created_ts_ms / 1000)
+
+    @property
+    def modified_date(self) -> Optional[datetime]:
+        """Ngày chỉnh sửa cuối cùng, chỉ tạo datetime khi cần hiển thị."""
+        if self.modified_ts_ms is None:
+            return None
+        return datetime.fromtimestamp(self.modified_ts_ms / 1000)
+
+    @property
+    def sort_key(self) -> int:
+        """Key sắp xếp theo thời gian chỉnh sửa (fallback ngày tạo), milliseconds."""
+        return self.modified_ts_ms or self.created_ts_ms or 0
+
     @classmethod
-    def from_folder(cls, folder_path: str) -> Optional['Project']:
+    def from_folder(
+        cls,
+        folder_path: str,
+        folder_stat: Optional[os.stat_result] = None
+    ) -> Optional['Project']:
         """
         Tạo Project từ thư mục project.
 
@@ -45,89 +133,91 @@ class Project:
 
         Args:
             folder_path: Đường dẫn đến thư mục project
+            folder_stat: Kết quả stat của thư mục nếu caller đã có sẵn
+                (vd: từ os.DirEntry.stat()), tránh phải stat lại
 
         Returns:
             Project object nếu thành công, None nếu thất bại
         """
-        if not os.path.isdir(folder_path):
+        if folder_stat is None:
+            try:
+                folder_stat = os.stat(folder_path)
+            except OSError:
+                return None
+
+        if not stat.S_ISDIR(folder_stat.st_mode):
             return None
 
         # Lấy ID từ tên thư mục
-        project_id = os.path.basename(folder_path)
+        project_id = sys.intern(os.path.basename(folder_path))
 
         # Mặc định lấy tên từ tên thư mục
         name = project_id
-        created_date = None
-        modified_date = None
+        created_ts_ms = None
+        modified_ts_ms = None
         is_trash = False
         metadata = {}
 
         # Thử đọc draft_info.json trước
-        draft_info_path = os.path.join(folder_path, 'draft_info.json')
-        draft_content_path = os.path.join(folder_path, 'draft_content.json')
+        draft_info_path = folder_path + _DRAFT_INFO_SUFFIX
+        draft_content_path = folder_path + _DRAFT_CONTENT_SUFFIX
 
         try:
-            # Đọc draft_info.json nếu tồn tại
-            if os.path.exists(draft_info_path):
-                with open(draft_info_path, 'r', encoding='utf-8') as f:
-                    info = json.load(f)
-                    name = info.get('draft_name', name)
-
-                    # Parse ngày tạo (timestamp milliseconds)
-                    if 'tm_draft_create' in info:
-                        created_date = datetime.fromtimestamp(
-                            info['tm_draft_create'] / 1000
-                        )
-
-                    # Parse ngày chỉnh sửa
-                    if 'tm_draft_modified' in info:
-                        modified_date = datetime.fromtimestamp(
-                            info['tm_draft_modified'] / 1000
-                        )
-
-                    # Kiểm tra trạng thái trash
-                    is_trash = info.get('draft_is_deleted', False)
-
-                    metadata = info
-
-            # Nếu không có draft_info.json, thử đọc draft_content.json
-            elif os.path.exists(draft_content_path):
-                with open(draft_content_path, 'r', encoding='utf-8') as f:
-                    content = json.load(f)
-                    name = content.get('name', name)
-                    metadata = content
-
-            # Nếu không có metadata, sử dụng thời gian file system
-            if created_date is None:
-                stat = os.stat(folder_path)
-                created_date = datetime.fromtimestamp(stat.st_ctime)
+            # Mở thẳng file thay vì kiểm tra tồn tại trước (một syscall thay vì hai)
+            try:
+                with open(draft_info_path, 'rb') as f:
+                    info = loads_json(f.read())
+                name, created_ts_ms, modified_ts_ms, is_trash = _extract_info_fields(
+                    info, name
+                )
+                metadata = _intern_keys(info)
 
-            if modified_date is None:
-                stat = os.stat(folder_path)
-                modified_date = datetime.fromtimestamp(stat.st_mtime)
+            except FileNotFoundError:
+                # Nếu không có draft_info.json, thử đọc draft_content.json
+                try:
+                    with open(draft_content_path, 'rb') as f:
+                        content = loads_json(f.read())
+                    name = content.get('name', name)
+                    metadata = _intern_keys(content)
+                except FileNotFoundError:
+                    pass
 
         except (json.JSONDecodeError, OSError, KeyError) as e:
             # Log lỗi nhưng vẫn tạo project với thông tin cơ bản
-            print(f"Lỗi đọc metadata cho project {folder_path}: {e}")
+            logger.warning("Lỗi đọc metadata cho project %s: %s", folder_path, e)
 
-            try:
-                stat = os.stat(folder_path)
-                created_date = datetime.fromtimestamp(stat.st_ctime)
-                modified_date = datetime.fromtimestamp(stat.st_mtime)
-            except OSError:
-                created_date = datetime.now()
-                modified_date = datetime.now()
+        # Nếu không có metadata, sử dụng thời gian file system
+        if created_ts_ms is None:
+            created_ts_ms = folder_stat.st_ctime_ns // 1_000_000
+        if modified_ts_ms is None:
+            modified_ts_ms = folder_stat.st_mtime_ns // 1_000_000
 
         return cls(
             id=project_id,
             name=name,
             path=folder_path,
-            created_date=created_date,
-            modified_date=modified_date,
+            created_ts_ms=created_ts_ms,
+            modified_ts_ms=modified_ts_ms,
             is_trash=is_trash,
             metadata=metadata
         )
 
+    @staticmethod
+    def quick_is_trash(folder_path: str) -> bool:
+        """
+        Kiểm tra nhanh project có nằm trong thùng rác không.
+
+        Quét bytes của draft_info.json để tìm cờ trash, chỉ parse JSON
+        khi cờ có vẻ được bật (để xác nhận).
+
+        Args:
+            folder_path: Đường dẫn đến thư mục project
+
+        Returns:
+            True nếu project nằm trong thùng rác
+        """
+        return probe_json_flag(folder_path + _DRAFT_INFO_SUFFIX, _TRASH_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Chuyển đổi Project thành dictionary.
@@ -135,12 +225,14 @@ class Project:
         Returns:
             Dictionary chứa thông tin project
         """
+        created_date = self.created_date
+        modified_date = self.modified_date
         return {
             'id': self.id,
             'name': self.name,
             'path': self.path,
-            'created_date': self.created_date.isoformat() if self.created_date else None,
-            'modified_date': self.modified_date.isoformat() if self.modified_date else None,
+            'created_date': created_date.isoformat() if created_date else None,
+            'modified_date': modified_date.isoformat() if modified_date else None,
             'is_trash': self.is_trash,
             'metadata': self.metadata
         }
@@ -152,7 +244,7 @@ class Project:
         Returns:
             Đường dẫn đến draft_content.json
         """
-        return os.path.join(self.path, 'draft_content.json')
+        return self.path + _DRAFT_CONTENT_SUFFIX
 
     def exists(self) -> bool:
         """
@@ -9,9 +9,12 @@ Service này sử dụng PyAutoGUI và pywinauto để:
 """
 
 import os
+import re
 import time
+import asyncio
+import threading
 import subprocess
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Generator, Iterator, List, Tuple
 from enum import Enum
 from datetime import datetime
 
@@ -30,7 +33,8 @@ except ImportError:
 
 try:
     from pywinauto import Application
-    from pywinauto.findwindows import ElementNotFoundError
+    from pywinauto.findwindows import ElementNotFoundError, find_windows
+    from pywinauto.timings import TimeoutError as PywinautoTimeoutError
     PYWINAUTO_AVAILABLE = True
 except ImportError:
     PYWINAUTO_AVAILABLE = False
@@ -55,6 +59,113 @@ class ExportStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# Chuỗi nhận diện process CapCut (so với tên process viết thường)
+_CAPCUT_TOKEN = 'capcut'
+
+# CapCut là ứng dụng GUI: không cần console và không kế thừa stdio.
+# Các hằng số này chỉ có trên Windows, nơi khác dùng 0 (mặc định).
+_POPEN_CREATION_FLAGS = (
+    getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    | getattr(subprocess, 'DETACHED_PROCESS', 0)
+)
+
+
+# ToolHelp32 snapshot (chỉ có trên Windows): liệt kê tên mọi process
+# bằng một snapshot thay vì truy vấn từng PID qua psutil
+_TOOLHELP_AVAILABLE = False
+if os.name == 'nt':
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class _PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ('dwSize', wintypes.DWORD),
+                ('cntUsage', wintypes.DWORD),
+                ('th32ProcessID', wintypes.DWORD),
+                ('th32DefaultHeapID', ctypes.c_size_t),
+                ('th32ModuleID', wintypes.DWORD),
+                ('cntThreads', wintypes.DWORD),
+                ('th32ParentProcessID', wintypes.DWORD),
+                ('pcPriClassBase', ctypes.c_long),
+                ('dwFlags', wintypes.DWORD),
+                ('szExeFile', ctypes.c_wchar * 260),
+            ]
+
+        # Dùng instance WinDLL riêng để khai báo argtypes không ảnh hưởng nơi khác
+        _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        _kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        _kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+        _kernel32.Process32FirstW.restype = wintypes.BOOL
+        _kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+        _kernel32.Process32NextW.restype = wintypes.BOOL
+        _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        _kernel32.CloseHandle.restype = wintypes.BOOL
+
+        _TH32CS_SNAPPROCESS = 0x00000002
+        _INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+        _TOOLHELP_AVAILABLE = True
+    except (ImportError, OSError, AttributeError):
+        _TOOLHELP_AVAILABLE = False
+
+
+def _win_list_capcut_pids() -> Optional[List[int]]:
+    """
+    Lấy PID các process CapCut bằng ToolHelp32 snapshot.
+
+    Returns:
+        Danh sách PID, hoặc None nếu không dùng được ToolHelp32
+        (không phải Windows hoặc tạo snapshot thất bại)
+    """
+    if not _TOOLHELP_AVAILABLE:
+        return None
+
+    snapshot = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if not snapshot or snapshot == _INVALID_HANDLE_VALUE:
+        return None
+
+    try:
+        entry = _PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(_PROCESSENTRY32W)
+        entry_ref = ctypes.byref(entry)
+
+        pids = []
+        ok = _kernel32.Process32FirstW(snapshot, entry_ref)
+        while ok:
+            if _CAPCUT_TOKEN in entry.szExeFile.lower():
+                pids.append(entry.th32ProcessID)
+            ok = _kernel32.Process32NextW(snapshot, entry_ref)
+        return pids
+    finally:
+        _kernel32.CloseHandle(snapshot)
+
+
+def _iter_capcut_procs() -> Iterator['psutil.Process']:
+    """
+    Duyệt các process CapCut đang chạy.
+
+    Trên Windows, PID ứng viên lấy từ ToolHelp32 snapshot nên chỉ cần
+    tạo psutil.Process cho các process CapCut. Nơi khác chỉ tạo
+    psutil.Process cho từng PID và đọc đúng tên process, thay vì để
+    process_iter dựng sẵn thông tin cho mọi process.
+
+    Yields:
+        psutil.Process của các process CapCut
+    """
+    pids = _win_list_capcut_pids()
+    if pids is None:
+        pids = psutil.pids()
+
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            if _CAPCUT_TOKEN in proc.name().lower():
+                yield proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+
 class AutomationService:
     """
     Service tự động hóa thao tác với CapCut.
@@ -70,10 +181,29 @@ class AutomationService:
     APP_OPEN_TIMEOUT = 30
     PROJECT_LOAD_TIMEOUT = 60
     EXPORT_TIMEOUT = 600  # 10 phút
+    PROJECT_LOAD_DELAY = 5
+
+    # Chu kỳ kiểm tra cancel khi chờ trên event loop (giây)
+    CANCEL_POLL_INTERVAL = 0.05
+
+    # Timeout ngắn cho các lệnh UIA trên đường click Export (có fallback hotkey)
+    UIA_TIMEOUT = 1
 
     # Tên cửa sổ CapCut
     CAPCUT_WINDOW_TITLES = ["CapCut", "剪映", "JianyingPro"]
 
+    # Một regex khớp mọi tên cửa sổ, tránh enumerate cửa sổ cho từng tên
+    CAPCUT_TITLE_RE = r".*(?:" + "|".join(map(re.escape, CAPCUT_WINDOW_TITLES)) + r").*"
+
+    # Điều kiện tìm nút Export, càng cụ thể thì UIA càng ít node phải duyệt
+    EXPORT_BUTTON_CRITERIA = {
+        'title_re': "Export|导出|匯出",
+        'control_type': "Button",
+        'class_name': "Button",
+        'top_level_only': False,
+        'found_index': 0,
+    }
+
     def __init__(
         self,
         capcut_exe_path: str,
@@ -95,7 +225,7 @@ class AutomationService:
         self.capcut_exe_path = capcut_exe_path
         self.log_callback = log_callback or (lambda x: print(x))
         self.status_callback = status_callback or (lambda s, m: None)
-        self._cancelled = False
+        self._cancel_event = threading.Event()
         self.use_vision = use_vision and VISION_AVAILABLE
 
         # Khởi tạo vision service nếu có
@@ -116,6 +246,21 @@ class AutomationService:
         self.retry_attempts = 3
         self.retry_delay = 2
 
+        # Process CapCut do service khởi chạy và PID CapCut đã phát hiện
+        self._capcut_process: Optional[subprocess.Popen] = None
+        self._capcut_pid: Optional[int] = None
+
+        # Application UIA và các wrapper dùng lại cho thao tác điều khiển (tạo lazy)
+        self._uia_app: Optional['Application'] = None
+        self._top_window = None
+        self._export_button = None
+
+        # UIA không tìm được nút Export: bỏ qua UIA, dùng hotkey cho các lần sau
+        self._uia_unavailable = False
+
+        # Xếp hàng các lần export_project_async (chỉ có một cửa sổ CapCut)
+        self._export_lock: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+
     def _log(self, message: str) -> None:
         """Ghi log message."""
         self.log_callback(message)
@@ -135,13 +280,40 @@ class AutomationService:
             self._log("psutil không khả dụng, bỏ qua kiểm tra process")
             return False
 
-        for proc in psutil.process_iter(['name']):
-            try:
-                if 'capcut' in proc.info['name'].lower():
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return False
+        if self._cached_capcut_proc() is not None:
+            return True
+
+        proc = next(_iter_capcut_procs(), None)
+        if proc is None:
+            return False
+
+        self._capcut_pid = proc.pid
+        return True
+
+    def _cached_capcut_proc(self) -> Optional['psutil.Process']:
+        """
+        Lấy process CapCut theo PID đã cache mà không quét toàn bộ process.
+
+        PID chỉ được dùng khi process còn sống và vẫn là CapCut
+        (tránh trường hợp PID đã bị hệ điều hành cấp lại).
+
+        Returns:
+            psutil.Process nếu PID cache còn hợp lệ, None nếu không
+        """
+        pid = self._capcut_pid
+        if pid is None:
+            return None
+
+        try:
+            if psutil.pid_exists(pid):
+                proc = psutil.Process(pid)
+                if _CAPCUT_TOKEN in proc.name().lower():
+                    return proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+        self._capcut_pid = None
+        return None
 
     def close_capcut(self) -> bool:
         """
@@ -150,18 +322,35 @@ class AutomationService:
         Returns:
             True nếu đóng thành công
         """
+        # Kết nối UIA cũ không còn hợp lệ sau khi đóng CapCut
+        self._clear_ui_cache()
+        self._capcut_pid = None
+        closed = False
+
+        # Đóng process do chính service khởi chạy trước, không cần quét process
+        process = self._capcut_process
+        self._capcut_process = None
+        if process is not None and process.poll() is None:
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+                closed = True
+                self._log(f"Đã đóng CapCut (PID: {process.pid})")
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+
         if not PSUTIL_AVAILABLE:
-            self._log("psutil không khả dụng")
-            return False
+            if not closed:
+                self._log("psutil không khả dụng")
+            return closed
 
-        closed = False
-        for proc in psutil.process_iter(['name', 'pid']):
+        # Vẫn quét để đóng mọi instance CapCut khác (không do handle này khởi chạy)
+        for proc in _iter_capcut_procs():
             try:
-                if 'capcut' in proc.info['name'].lower():
-                    proc.terminate()
-                    proc.wait(timeout=5)
-                    closed = True
-                    self._log(f"Đã đóng CapCut (PID: {proc.info['pid']})")
+                proc.terminate()
+                proc.wait(timeout=5)
+                closed = True
+                self._log(f"Đã đóng CapCut (PID: {proc.pid})")
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
                 continue
 
@@ -183,19 +372,46 @@ class AutomationService:
             self._log(f"Không tìm thấy CapCut.exe tại: {self.capcut_exe_path}")
             return False
 
+        running = self.is_capcut_running()
+
+        # Không cần mở project cụ thể: dùng lại CapCut đang chạy
+        if running and not project_path:
+            self._log("CapCut đang chạy, dùng lại cửa sổ hiện tại")
+            return self._wait_for_window()
+
+        cmd = [self.capcut_exe_path]
+        if project_path:
+            cmd.append(project_path)
+
+        return self._launch_and_wait(cmd, close_existing=running)
+
+    def _launch_and_wait(self, cmd: List[str], close_existing: bool = False) -> bool:
+        """
+        Khởi chạy CapCut với command line và chờ cửa sổ xuất hiện.
+
+        Args:
+            cmd: Command line (exe và tham số)
+            close_existing: Đóng CapCut đang chạy trước khi khởi chạy
+
+        Returns:
+            True nếu cửa sổ CapCut xuất hiện
+        """
         try:
-            # Đóng CapCut nếu đang chạy
-            if self.is_capcut_running():
+            if close_existing:
                 self._log("CapCut đang chạy, đang đóng...")
                 self.close_capcut()
                 time.sleep(2)
 
-            # Mở CapCut
-            cmd = [self.capcut_exe_path]
-            if project_path:
-                cmd.append(project_path)
-
-            subprocess.Popen(cmd, shell=False)
+            self._capcut_process = subprocess.Popen(
+                cmd,
+                shell=False,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=_POPEN_CREATION_FLAGS,
+                close_fds=True
+            )
+            self._capcut_pid = self._capcut_process.pid
             self._log(f"Đã mở CapCut: {self.capcut_exe_path}")
 
             # Chờ cửa sổ CapCut xuất hiện
@@ -223,22 +439,25 @@ class AutomationService:
             time.sleep(5)
             return True
 
-        while time.time() - start_time < timeout:
-            if self._cancelled:
-                return False
+        # Poll dày lúc đầu để bắt cửa sổ xuất hiện nhanh, giãn dần đến 1 giây
+        interval = 0.05
+        now = time.time
+        wait = self._cancel_event.wait
+        title_re = self.CAPCUT_TITLE_RE
 
+        while now() - start_time < timeout:
             try:
-                for title in self.CAPCUT_WINDOW_TITLES:
-                    try:
-                        Application(backend='uia').connect(title_re=f".*{title}.*")
-                        self._log("Đã tìm thấy cửa sổ CapCut")
-                        return True
-                    except ElementNotFoundError:
-                        continue
+                # Chỉ cần biết cửa sổ tồn tại: duyệt handle cửa sổ bằng backend
+                # win32 (rẻ), không tạo Application
+                if find_windows(title_re=title_re, backend='win32'):
+                    self._log("Đã tìm thấy cửa sổ CapCut")
+                    return True
             except Exception:
                 pass
 
-            time.sleep(0.5)
+            if wait(interval):
+                return False
+            interval = min(interval * 1.5, 1.0)
 
         self._log("Timeout: Không tìm thấy cửa sổ CapCut")
         return False
@@ -261,48 +480,169 @@ class AutomationService:
         Returns:
             True nếu xuất thành công
         """
+        log = self._log
+        is_cancelled = self._cancel_event.is_set
+
         for attempt in range(retry_count):
-            if self._cancelled:
+            if is_cancelled():
                 self._update_status(ExportStatus.CANCELLED, "Đã hủy")
                 return False
 
             if attempt > 0:
-                self._log(f"Thử lại lần {attempt + 1}...")
+                log(f"Thử lại lần {attempt + 1}...")
 
             try:
-                # Mở CapCut
-                if not self.open_capcut(project_path):
-                    continue
-
-                # Chờ project load
-                self._update_status(
-                    ExportStatus.LOADING_PROJECT,
-                    "Đang tải project..."
-                )
-                time.sleep(5)  # Chờ project load
-
-                # Click Export
-                if not self._click_export():
-                    continue
-
-                # Chờ xuất xong
-                self._update_status(ExportStatus.EXPORTING, "Đang xuất video...")
-                if not self._wait_for_export():
-                    continue
-
-                # Đóng CapCut
+                if self._run_steps(self._export_steps(project_path)):
+                    return True
+
+            except Exception as e:
+                log(f"Lỗi xuất project: {e}")
                 self.close_capcut()
 
-                self._update_status(ExportStatus.COMPLETED, "Xuất thành công!")
-                return True
+        self._update_status(ExportStatus.FAILED, "Xuất thất bại sau nhiều lần thử")
+        return False
+
+    async def export_project_async(self, project_path: str, retry_count: int = 3) -> bool:
+        """
+        Xuất video từ project mà không chặn event loop.
+
+        Cùng quy trình với export_project, nhưng các bước blocking
+        (mở CapCut, click, vision polling) chạy trong executor và các
+        khoảng chờ dùng asyncio.sleep. Mọi lần xuất dùng chung một cửa sổ
+        CapCut (và process/kết nối UIA đã cache) nên các lần gọi đồng thời
+        được xếp hàng qua một asyncio.Lock, chạy lần lượt từng project.
+
+        Args:
+            project_path: Đường dẫn đến project
+            retry_count: Số lần thử lại nếu thất bại
+
+        Returns:
+            True nếu xuất thành công
+        """
+        # Lock tạo lazy trong event loop đang chạy (asyncio.Lock gắn với loop)
+        loop = asyncio.get_running_loop()
+        if self._export_lock is None or self._export_lock[0] is not loop:
+            self._export_lock = (loop, asyncio.Lock())
+
+        async with self._export_lock[1]:
+            return await self._export_project_async(project_path, retry_count)
+
+    async def _export_project_async(self, project_path: str, retry_count: int) -> bool:
+        """Thân của export_project_async, chạy khi đang giữ _export_lock."""
+        loop = asyncio.get_running_loop()
+        log = self._log
+        is_cancelled = self._cancel_event.is_set
+
+        for attempt in range(retry_count):
+            if is_cancelled():
+                self._update_status(ExportStatus.CANCELLED, "Đã hủy")
+                return False
+
+            if attempt > 0:
+                log(f"Thử lại lần {attempt + 1}...")
+
+            try:
+                if await self._run_steps_async(self._export_steps(project_path)):
+                    return True
 
             except Exception as e:
-                self._log(f"Lỗi xuất project: {e}")
-                self.close_capcut()
+                log(f"Lỗi xuất project: {e}")
+                await loop.run_in_executor(None, self.close_capcut)
 
         self._update_status(ExportStatus.FAILED, "Xuất thất bại sau nhiều lần thử")
         return False
 
+    def _export_steps(self, project_path: str) -> Generator[Any, Any, bool]:
+        """
+        State machine của một lần xuất.
+
+        Generator yield từng bước cho driver thực thi:
+        - callable: tác vụ blocking, driver gửi lại kết quả
+        - số: thời gian cần chờ (giây)
+
+        Args:
+            project_path: Đường dẫn đến project
+
+        Returns:
+            True nếu lần xuất thành công
+        """
+        # Mở CapCut
+        if not (yield lambda: self.open_capcut(project_path)):
+            return False
+
+        # Chờ project load
+        self._update_status(ExportStatus.LOADING_PROJECT, "Đang tải project...")
+        yield self.PROJECT_LOAD_DELAY
+
+        # Click Export
+        if not (yield self._click_export):
+            return False
+
+        # Chờ xuất xong
+        self._update_status(ExportStatus.EXPORTING, "Đang xuất video...")
+        if not (yield self._wait_for_export):
+            return False
+
+        # Đóng CapCut
+        yield self.close_capcut
+
+        self._update_status(ExportStatus.COMPLETED, "Xuất thành công!")
+        return True
+
+    def _run_steps(self, steps: Generator[Any, Any, bool]) -> bool:
+        """Thực thi state machine xuất trên thread hiện tại."""
+        try:
+            step = next(steps)
+            while True:
+                if callable(step):
+                    result = step()
+                else:
+                    # Chờ trên event để cancel() có hiệu lực ngay
+                    if self._cancel_event.wait(step):
+                        return False
+                    result = None
+                step = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    async def _run_steps_async(self, steps: Generator[Any, Any, bool]) -> bool:
+        """Thực thi state machine xuất trên event loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            step = next(steps)
+            while True:
+                if callable(step):
+                    result = await loop.run_in_executor(None, step)
+                else:
+                    if await self._wait_cancel_async(step):
+                        return False
+                    result = None
+                step = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    async def _wait_cancel_async(self, timeout: float) -> bool:
+        """
+        Chờ trên event loop, dừng sớm khi cancel() được gọi.
+
+        threading.Event không await được nên chờ từng khoảng CANCEL_POLL_INTERVAL,
+        cancel có hiệu lực gần như ngay như _cancel_event.wait ở driver đồng bộ.
+
+        Args:
+            timeout: Thời gian chờ tối đa (giây)
+
+        Returns:
+            True nếu đã bị hủy
+        """
+        is_cancelled = self._cancel_event.is_set
+        deadline = time.monotonic() + timeout
+        while not is_cancelled():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(remaining, self.CANCEL_POLL_INTERVAL))
+        return True
+
     def _click_export(self) -> bool:
         """
         Click vào nút Export.
@@ -314,9 +654,50 @@ class AutomationService:
         if self.use_vision and self.vision_service and self.template_manager:
             return self._click_export_with_vision()
 
+        # Thử click trực tiếp nút Export qua UIA
+        if self._click_export_uia():
+            return True
+
         # Fallback sang phương pháp thủ công
         return self._click_export_manual()
 
+    def _click_export_uia(self) -> bool:
+        """
+        Click nút Export qua pywinauto (backend UIA).
+
+        Wrapper của nút được cache sau lần tìm đầu tiên để không phải
+        duyệt lại cây control ở các lần export sau.
+
+        Returns:
+            True nếu click thành công
+        """
+        if not PYWINAUTO_AVAILABLE or self._uia_unavailable:
+            return False
+
+        try:
+            if self._export_button is None:
+                window = self._get_top_window()
+                if window is None:
+                    self._uia_unavailable = True
+                    return False
+                self._export_button = window.child_window(
+                    **self.EXPORT_BUTTON_CRITERIA
+                ).wait('exists', timeout=self.UIA_TIMEOUT)
+
+            self._export_button.click_input()
+            self._log("Đã click nút Export")
+            return True
+
+        except Exception:
+            if self._export_button is not None:
+                # Wrapper có thể đã hết hạn (UI thay đổi), tìm lại ở lần sau
+                self._export_button = None
+            else:
+                # Không tìm được qua UIA: các lần sau dùng thẳng hotkey thay vì
+                # chờ timeout UIA ở mỗi lần thử
+                self._uia_unavailable = True
+            return False
+
     def _click_export_with_vision(self) -> bool:
         """
         Click Export bằng vision service.
@@ -333,17 +714,22 @@ class AutomationService:
             self._log("Không tìm thấy template export_button, fallback sang manual")
             return self._click_export_manual()
 
+        log = self._log
+        wait = self._cancel_event.wait
+        click_on_image = self.vision_service.click_on_image
+
         # Thử click với retry
         for attempt in range(self.retry_attempts):
-            if self._cancelled:
+            if self._cancel_event.is_set():
                 return False
 
             if attempt > 0:
-                self._log(f"Thử lại lần {attempt + 1}...")
-                time.sleep(self.retry_delay)
+                log(f"Thử lại lần {attempt + 1}...")
+                if wait(self.retry_delay):
+                    return False
 
             # Tìm và click
-            success = self.vision_service.click_on_image(
+            success = click_on_image(
                 export_template,
                 confidence=0.8,
                 timeout=10
@@ -401,26 +787,71 @@ class AutomationService:
             return False
 
         try:
-            for title in self.CAPCUT_WINDOW_TITLES:
-                try:
-                    app = Application(backend='uia').connect(title_re=f".*{title}.*", timeout=5)
-                    window = app.top_window()
-                    window.set_focus()
-                    self._log(f"Đã focus vào cửa sổ: {title}")
-                    return True
-                except ElementNotFoundError:
-                    continue
-                except Exception as e:
-                    self._log(f"Lỗi focus window: {e}")
-                    continue
+            window = self._get_top_window()
+            if window is None:
+                self._log("Không thể focus vào cửa sổ CapCut")
+                return False
 
-            self._log("Không thể focus vào cửa sổ CapCut")
-            return False
+            window.set_focus()
+            self._log("Đã focus vào cửa sổ CapCut")
+            return True
 
         except Exception as e:
+            # Kết nối có thể đã hỏng (CapCut bị đóng từ bên ngoài), tạo lại lần sau
+            self._clear_ui_cache()
             self._log(f"Lỗi focus window: {e}")
             return False
 
+    def _get_uia_app(self) -> Optional['Application']:
+        """
+        Lấy Application backend UIA kết nối tới CapCut.
+
+        Kết nối chỉ được tạo khi cần thao tác control và được dùng lại
+        cho các lần gọi sau. Magic lookup (truy cập control qua thuộc tính,
+        best_match) bị tắt, nên control phải được tìm bằng điều kiện tường
+        minh như title, auto_id hoặc control_type.
+
+        Returns:
+            Application đã kết nối hoặc None nếu không tìm thấy cửa sổ
+        """
+        if self._uia_app is not None:
+            return self._uia_app
+
+        try:
+            app = Application(backend='uia', allow_magic_lookup=False)
+            self._uia_app = app.connect(
+                title_re=self.CAPCUT_TITLE_RE, found_index=0, timeout=self.UIA_TIMEOUT
+            )
+            return self._uia_app
+        except (ElementNotFoundError, PywinautoTimeoutError):
+            # connect có timeout raise TimeoutError thay vì ElementNotFoundError
+            return None
+
+    def _get_top_window(self):
+        """
+        Lấy cửa sổ chính của CapCut, cache sau lần tìm đầu tiên.
+
+        Returns:
+            WindowSpecification của cửa sổ chính hoặc None
+        """
+        if self._top_window is not None:
+            return self._top_window
+
+        app = self._get_uia_app()
+        if app is None:
+            return None
+
+        window = app.top_window()
+        window.wait('ready', timeout=self.UIA_TIMEOUT)
+        self._top_window = window
+        return window
+
+    def _clear_ui_cache(self) -> None:
+        """Xóa kết nối UIA và các wrapper đã cache."""
+        self._uia_app = None
+        self._top_window = None
+        self._export_button = None
+
     def send_keyboard_shortcut(self, *keys) -> bool:
         """
         Gửi keyboard shortcut.
@@ -501,26 +932,26 @@ class AutomationService:
 
         self._log("Đang chờ export hoàn tất (vision detection)...")
 
-        while time.time() - start_time < timeout:
-            if self._cancelled:
-                return False
+        log = self._log
+        now = time.time
+        wait = self._cancel_event.wait
+        find_image = self.vision_service.find_image_on_screen
 
+        while now() - start_time < timeout:
             # Kiểm tra có dialog "Export Complete" không
-            result = self.vision_service.find_image_on_screen(
-                complete_template,
-                confidence=0.8
-            )
+            result = find_image(complete_template, confidence=0.8)
 
             if result.found:
-                self._log("✓ Phát hiện export đã hoàn tất")
+                log("✓ Phát hiện export đã hoàn tất")
                 return True
 
             # Log tiến trình
-            elapsed = int(time.time() - start_time)
+            elapsed = int(now() - start_time)
             if elapsed % 10 == 0:
-                self._log(f"Đang xuất... ({elapsed}s / {timeout}s)")
+                log(f"Đang xuất... ({elapsed}s / {timeout}s)")
 
-            time.sleep(check_interval)
+            if wait(check_interval):
+                return False
 
         self._log("Timeout: Xuất video quá lâu")
 
@@ -542,19 +973,20 @@ class AutomationService:
             True nếu xuất thành công
         """
         start_time = time.time()
+        now = time.time
+        wait = self._cancel_event.wait
 
-        while time.time() - start_time < timeout:
-            if self._cancelled:
-                return False
-
+        while now() - start_time < timeout:
             # Kiểm tra xem export đã xong chưa
             # (Có thể kiểm tra qua dialog hoàn thành hoặc progress bar)
 
-            time.sleep(5)
+            # Chờ trên event thay vì sleep để cancel() có hiệu lực ngay
+            if wait(5):
+                return False
 
             # Giả lập: sau 10 giây coi như xong
             # Trong production nên có cách kiểm tra tốt hơn
-            if time.time() - start_time > 10:
+            if now() - start_time > 10:
                 return True
 
         self._log("Timeout: Xuất video quá lâu")
@@ -562,12 +994,19 @@ class AutomationService:
 
     def cancel(self) -> None:
         """Hủy quá trình đang thực hiện."""
-        self._cancelled = True
+        self._cancel_event.set()
         self._log("Đã yêu cầu hủy")
 
+    def close(self) -> None:
+        """Giải phóng backend chụp màn hình của vision service (dùng lại được sau đó)."""
+        if self.vision_service is not None:
+            self.vision_service.close()
+
     def reset(self) -> None:
         """Reset trạng thái service."""
-        self._cancelled = False
+        self._cancel_event.clear()
+        self._clear_ui_cache()
+        self._uia_unavailable = False
 
     @staticmethod
     def check_dependencies() -> dict:
@@ -586,7 +1025,6 @@ class AutomationService:
 
         # Kiểm tra chi tiết vision dependencies nếu có
         if VISION_AVAILABLE:
-            from services.vision_service import VisionService
             deps['vision_details'] = VisionService.check_dependencies()
 
         return deps
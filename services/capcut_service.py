@@ -9,12 +9,151 @@ Service này cung cấp các chức năng:
 """
 
 import os
-from typing import Optional, List
+import mmap
+import time
+from functools import partial
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Sequence
 from models.project import Project
 from models.config import Config
 from services.file_service import FileService
 
 
+# Đường dẫn mặc định trên Windows, vị trí hay gặp nhất đứng đầu.
+# dict.fromkeys loại bỏ trùng lặp (vd: khi expanduser không đổi được ~)
+# mà vẫn giữ thứ tự ưu tiên.
+_DEFAULT_EXE_PATHS: Tuple[str, ...] = tuple(dict.fromkeys((
+    os.path.expanduser(r"~\AppData\Local\CapCut\Apps\CapCut.exe"),
+    r"C:\Program Files\CapCut\CapCut.exe",
+    os.path.expanduser(r"~\AppData\Local\Programs\CapCut\CapCut.exe"),
+    r"C:\Program Files (x86)\CapCut\CapCut.exe",
+)))
+
+# Thư mục data giữ nguyên thứ tự cũ: JianyingPro được ưu tiên khi cả hai cùng tồn tại
+_DEFAULT_DATA_PATHS: Tuple[str, ...] = tuple(dict.fromkeys((
+    os.path.expanduser(
+        r"~\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
+    ),
+    os.path.expanduser(
+        r"~\AppData\Local\CapCut\User Data\Projects\com.lveditor.draft"
+    ),
+)))
+
+
+# Pool dùng chung để scandir song song các thư mục cha khi dò đường dẫn
+# mặc định (thread chỉ được tạo khi có việc)
+_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='capcut-probe')
+
+
+def _scan_names(parent: str) -> Dict[str, os.DirEntry]:
+    """
+    Đọc một thư mục, trả về các entry theo tên đã chuẩn hóa (normcase).
+
+    Args:
+        parent: Đường dẫn thư mục
+
+    Returns:
+        Dictionary tên -> DirEntry, rỗng nếu không đọc được thư mục
+    """
+    try:
+        with os.scandir(parent) as it:
+            return {os.path.normcase(e.name): e for e in it}
+    except OSError:
+        return {}
+
+
+def _first_existing(paths: Sequence[str], is_dir: bool) -> Optional[str]:
+    """
+    Tìm đường dẫn đầu tiên tồn tại trong danh sách.
+
+    Các đường dẫn được gom theo thư mục cha, mỗi thư mục cha chỉ
+    scandir một lần thay vì stat từng đường dẫn. Khi có nhiều thư mục
+    cha, các lần scandir chạy song song.
+
+    Args:
+        paths: Danh sách đường dẫn ứng viên (theo thứ tự ưu tiên)
+        is_dir: True nếu cần tìm thư mục, False nếu cần tìm file
+
+    Returns:
+        Đường dẫn đầu tiên tồn tại hoặc None
+    """
+    parents = list(dict.fromkeys(os.path.dirname(path) for path in paths))
+    if len(parents) > 1:
+        entries_by_parent = dict(zip(parents, _PROBE_EXECUTOR.map(_scan_names, parents)))
+    else:
+        entries_by_parent = {parent: _scan_names(parent) for parent in parents}
+
+    for path in paths:
+        parent, name = os.path.split(path)
+
+        entry = entries_by_parent[parent].get(os.path.normcase(name))
+        if entry is None:
+            continue
+
+        try:
+            if entry.is_dir() if is_dir else entry.is_file():
+                return path
+        except OSError:
+            continue
+
+    return None
+
+
+# File metadata Project.from_folder đọc, theo thứ tự ưu tiên
+_METADATA_FILES = ('draft_info.json', 'draft_content.json')
+
+# Key cache của một project: (mtime_ns thư mục, mtime_ns file metadata, size file metadata)
+_ProjectKey = Tuple[int, int, int]
+
+
+def _project_key(folder_path: str, folder_stat: os.stat_result) -> _ProjectKey:
+    """
+    Tạo key cache cho project từ stat của file metadata được đọc.
+
+    Sửa draft_info.json tại chỗ (đổi tên, chuyển vào thùng rác) không đổi
+    mtime thư mục project nên key phải gồm stat của chính file metadata.
+
+    Args:
+        folder_path: Đường dẫn đến thư mục project
+        folder_stat: Stat của thư mục project
+
+    Returns:
+        Tuple (mtime thư mục, mtime file metadata, size file metadata);
+        hai giá trị sau là (0, -1) nếu project không có file metadata
+    """
+    for name in _METADATA_FILES:
+        try:
+            file_stat = os.stat(os.path.join(folder_path, name))
+        except OSError:
+            continue
+        return (folder_stat.st_mtime_ns, file_stat.st_mtime_ns, file_stat.st_size)
+    return (folder_stat.st_mtime_ns, 0, -1)
+
+
+def _load_project(
+    folder_path: str,
+    folder_stat: os.stat_result,
+    skip_trash: bool = False
+) -> Optional[Project]:
+    """
+    Đọc project từ thư mục project với stat đã có sẵn.
+
+    Args:
+        folder_path: Đường dẫn đến thư mục project
+        folder_stat: Stat của thư mục (thường lấy từ DirEntry)
+        skip_trash: Bỏ qua project trong thùng rác (kiểm tra nhanh cờ
+            trash trước, không parse toàn bộ metadata)
+
+    Returns:
+        Project object, hoặc None nếu bị bỏ qua hoặc lỗi
+    """
+    if skip_trash and Project.quick_is_trash(folder_path):
+        return None
+
+    return Project.from_folder(folder_path, folder_stat)
+
+
 class CapCutService:
     """
     Service tương tác với CapCut.
@@ -23,22 +162,15 @@ class CapCutService:
     từ các project CapCut trên máy.
     """
 
-    # Đường dẫn mặc định trên Windows
-    DEFAULT_EXE_PATHS = [
-        r"C:\Program Files\CapCut\CapCut.exe",
-        r"C:\Program Files (x86)\CapCut\CapCut.exe",
-        os.path.expanduser(r"~\AppData\Local\CapCut\Apps\CapCut.exe"),
-        os.path.expanduser(r"~\AppData\Local\Programs\CapCut\CapCut.exe"),
-    ]
-
-    DEFAULT_DATA_PATHS = [
-        os.path.expanduser(
-            r"~\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
-        ),
-        os.path.expanduser(
-            r"~\AppData\Local\CapCut\User Data\Projects\com.lveditor.draft"
-        ),
-    ]
+    # Đường dẫn mặc định trên Windows (tính sẵn khi import)
+    DEFAULT_EXE_PATHS = _DEFAULT_EXE_PATHS
+    DEFAULT_DATA_PATHS = _DEFAULT_DATA_PATHS
+
+    # Số thread tối đa khi đọc metadata project
+    MAX_PARSE_WORKERS = 8
+
+    # Thời gian (giây) giữ kết quả tìm CapCut.exe / thư mục data
+    FIND_CACHE_TTL = 30.0
 
     def __init__(self, config: Optional[Config] = None):
         """
@@ -50,6 +182,24 @@ class CapCutService:
         self.config = config or Config()
         self.file_service = FileService()
 
+        # Bind sẵn các hàm file service dùng thường xuyên
+        self._file_exists = self.file_service.file_exists
+        self._folder_exists = self.file_service.folder_exists
+        self._scan_folders = self.file_service.scan_folders
+
+        # Cache kết quả tìm kiếm: (giá trị config, đường dẫn tìm được, hạn dùng)
+        self._exe_cache: Optional[Tuple[str, Optional[str], float]] = None
+        self._data_cache: Optional[Tuple[str, Optional[str], float]] = None
+
+        # Cache danh sách project theo include_trash:
+        # include_trash -> ((data_folder, key của từng project), projects)
+        self._projects_cache: Dict[
+            bool, Tuple[Tuple[str, Tuple[Tuple[str, _ProjectKey], ...]], List[Project]]
+        ] = {}
+
+        # Cache từng project: đường dẫn -> (key từ stat thư mục và file metadata, Project)
+        self._project_cache: Dict[str, Tuple[_ProjectKey, Project]] = {}
+
     def find_capcut_exe(self) -> Optional[str]:
         """
         Tự động tìm đường dẫn CapCut.exe.
@@ -59,17 +209,19 @@ class CapCutService:
         Returns:
             Đường dẫn đến CapCut.exe nếu tìm thấy, None nếu không
         """
-        # Kiểm tra config trước
-        if self.config.capcut_exe_path:
-            if self.file_service.file_exists(self.config.capcut_exe_path):
-                return self.config.capcut_exe_path
+        config_path = self.config.capcut_exe_path
+        cached = self._exe_cache
+        if cached is not None and cached[0] == config_path and cached[2] > time.monotonic():
+            return cached[1]
 
-        # Tìm trong các đường dẫn mặc định
-        for path in self.DEFAULT_EXE_PATHS:
-            if self.file_service.file_exists(path):
-                return path
+        # Kiểm tra config trước, sau đó tìm trong các đường dẫn mặc định
+        if config_path and self._file_exists(config_path):
+            path = config_path
+        else:
+            path = _first_existing(self.DEFAULT_EXE_PATHS, is_dir=False)
 
-        return None
+        self._exe_cache = (config_path, path, time.monotonic() + self.FIND_CACHE_TTL)
+        return path
 
     def find_data_folder(self) -> Optional[str]:
         """
@@ -82,23 +234,27 @@ class CapCutService:
         Returns:
             Đường dẫn đến thư mục data nếu tìm thấy, None nếu không
         """
-        # Kiểm tra config trước
-        if self.config.data_folder_path:
-            if self.file_service.folder_exists(self.config.data_folder_path):
-                return self.config.data_folder_path
+        config_path = self.config.data_folder_path
+        cached = self._data_cache
+        if cached is not None and cached[0] == config_path and cached[2] > time.monotonic():
+            return cached[1]
 
-        # Tìm trong các đường dẫn mặc định
-        for path in self.DEFAULT_DATA_PATHS:
-            if self.file_service.folder_exists(path):
-                return path
+        # Kiểm tra config trước, sau đó tìm trong các đường dẫn mặc định
+        if config_path and self._folder_exists(config_path):
+            path = config_path
+        else:
+            path = _first_existing(self.DEFAULT_DATA_PATHS, is_dir=True)
 
-        return None
+        self._data_cache = (config_path, path, time.monotonic() + self.FIND_CACHE_TTL)
+        return path
 
     def get_projects(self, include_trash: bool = False) -> List[Project]:
         """
         Lấy danh sách các project CapCut.
 
         Đọc từ thư mục data và parse metadata của từng project.
+        Kết quả được cache đến khi có project được thêm/xóa hoặc file
+        metadata của project thay đổi.
 
         Args:
             include_trash: Có bao gồm project trong thùng rác không
@@ -106,29 +262,80 @@ class CapCutService:
         Returns:
             Danh sách Project objects
         """
+        return list(self._load_projects(include_trash))
+
+    def _load_projects(self, include_trash: bool) -> List[Project]:
+        """
+        Đọc danh sách project, dùng cache nếu không project nào thay đổi.
+
+        Args:
+            include_trash: Có bao gồm project trong thùng rác không
+
+        Returns:
+            Danh sách Project (dùng chung với cache, không được sửa)
+        """
         projects = []
 
-        # Tìm thư mục data
         data_folder = self.find_data_folder()
         if not data_folder:
             return projects
 
-        # Liệt kê các folder con (mỗi folder là một project)
-        project_folders = self.file_service.list_folders(data_folder)
-
-        for folder_path in project_folders:
-            project = Project.from_folder(folder_path)
-            if project:
-                # Lọc bỏ project trong thùng rác nếu cần
-                if include_trash or not project.is_trash:
-                    projects.append(project)
-
-        # Sắp xếp theo ngày chỉnh sửa (mới nhất trước)
-        projects.sort(
-            key=lambda p: p.modified_date or p.created_date,
-            reverse=True
-        )
-
+        # Liệt kê các folder con (mỗi folder là một project), giữ DirEntry để dùng lại stat.
+        # mtime thư mục data không đổi khi metadata project bị sửa tại chỗ nên
+        # key cache phải gồm key của từng project
+        scanned = []
+        for entry in self._scan_folders(data_folder):
+            try:
+                folder_stat = entry.stat()
+            except OSError:
+                continue
+            scanned.append((entry.path, folder_stat, _project_key(entry.path, folder_stat)))
+
+        cache_key = (data_folder, tuple((path, key) for path, _, key in scanned))
+        cached = self._projects_cache.get(include_trash)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        # Project có thư mục và file metadata chưa đổi được lấy lại từ cache,
+        # chỉ các project mới/thay đổi mới phải đọc metadata
+        old_cache = self._project_cache
+        new_cache: Dict[str, Tuple[_ProjectKey, Project]] = {}
+        load_paths = []
+        load_stats = []
+        load_keys = []
+
+        for path, folder_stat, key in scanned:
+            cached = old_cache.get(path)
+            if cached is not None and cached[0] == key:
+                new_cache[path] = cached
+            else:
+                load_paths.append(path)
+                load_stats.append(folder_stat)
+                load_keys.append(key)
+
+        # Kiểm tra trash và đọc metadata song song, phần lớn thời gian là chờ IO
+        if load_paths:
+            load = partial(_load_project, skip_trash=not include_trash)
+            workers = min(self.MAX_PARSE_WORKERS, len(load_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for key, project in zip(
+                    load_keys, executor.map(load, load_paths, load_stats)
+                ):
+                    if project:
+                        new_cache[project.path] = (key, project)
+
+        self._project_cache = new_cache
+
+        for _, project in new_cache.values():
+            # Lọc bỏ project trong thùng rác nếu cần
+            if include_trash or not project.is_trash:
+                projects.append(project)
+
+        # Sắp xếp theo ngày chỉnh sửa (mới nhất trước); list.sort chỉ tính key
+        # một lần cho mỗi phần tử
+        projects.sort(key=attrgetter('sort_key'), reverse=True)
+
+        self._projects_cache[include_trash] = (cache_key, projects)
         return projects
 
     def get_project_by_id(self, project_id: str) -> Optional[Project]:
@@ -145,11 +352,8 @@ class CapCutService:
         if not data_folder:
             return None
 
-        project_path = os.path.join(data_folder, project_id)
-        if self.file_service.folder_exists(project_path):
-            return Project.from_folder(project_path)
-
-        return None
+        # from_folder tự stat thư mục và trả về None nếu không tồn tại
+        return Project.from_folder(os.path.join(data_folder, project_id))
 
     def validate_project(self, project: Project) -> bool:
         """
@@ -161,12 +365,17 @@ class CapCutService:
         Returns:
             True nếu project hợp lệ và có thể xuất
         """
-        if not project.exists():
-            return False
-
-        # Kiểm tra file draft_content.json tồn tại
+        # Kiểm tra draft_content.json có dữ liệu timeline (key "tracks")
+        # bằng cách tìm trên mmap, không cần đọc và parse toàn bộ JSON.
+        # Mở được file nghĩa là thư mục project tồn tại, không cần kiểm tra riêng.
         draft_path = project.get_draft_path()
-        return self.file_service.file_exists(draft_path)
+        try:
+            with open(draft_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return mm.find(b'"tracks"') != -1
+        except (OSError, ValueError):
+            # ValueError: file rỗng, không thể mmap
+            return False
 
     def refresh_project(self, project: Project) -> Optional[Project]:
         """
@@ -190,7 +399,30 @@ class CapCutService:
         Returns:
             Số lượng project
         """
-        return len(self.get_projects(include_trash))
+        return self._count_projects(include_trash)
+
+    def _count_projects(self, include_trash: bool) -> int:
+        """
+        Đếm project mà không tạo Project object.
+
+        Chỉ quét tên thư mục và kiểm tra nhanh cờ trash.
+
+        Args:
+            include_trash: Có bao gồm project trong thùng rác không
+
+        Returns:
+            Số lượng project
+        """
+        data_folder = self.find_data_folder()
+        if not data_folder:
+            return 0
+
+        entries = self._scan_folders(data_folder)
+        if include_trash:
+            return len(entries)
+
+        quick_is_trash = Project.quick_is_trash
+        return sum(1 for entry in entries if not quick_is_trash(entry.path))
 
     def update_config(self, config: Config) -> None:
         """
@@ -200,6 +432,14 @@ class CapCutService:
             config: Config mới
         """
         self.config = config
+        self._exe_cache = None
+        self._data_cache = None
+        self.invalidate_project_cache()
+
+    def invalidate_project_cache(self) -> None:
+        """Xóa cache danh sách project và cache từng project."""
+        self._projects_cache.clear()
+        self._project_cache = {}
 
     def auto_detect(self) -> dict:
         """
@@ -5,13 +5,298 @@ Service này quản lý:
 - Đọc/ghi file cấu hình JSON
 - Kiểm tra file/folder tồn tại
 - Tạo thư mục output nếu chưa có
+
+Các thao tác là hàm cấp module, có thể gọi trực tiếp. Class FileService
+được giữ lại để tương thích với code cũ.
 """
 
 import os
 import shutil
+import logging
 from typing import Optional, Any, List
 from utils.helpers import safe_json_load, safe_json_save, ensure_directory
 
+logger = logging.getLogger(__name__)
+
+# GetFileAttributesW (Windows): kiểm tra tồn tại không cần mở handle như os.stat
+_INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+_FILE_ATTRIBUTE_DIRECTORY = 0x10
+_get_file_attributes = None
+
+
+def _win_attrs(path: str) -> Optional[int]:
+    """
+    Lấy file attributes qua GetFileAttributesW, bind hàm lazy ở lần gọi đầu.
+
+    Args:
+        path: Đường dẫn cần kiểm tra
+
+    Returns:
+        DWORD attributes (_INVALID_FILE_ATTRIBUTES nếu không tồn tại),
+        hoặc None nếu không chạy trên Windows
+    """
+    global _get_file_attributes
+
+    if os.name != 'nt':
+        return None
+
+    if _get_file_attributes is None:
+        import ctypes
+        from ctypes import wintypes
+
+        func = ctypes.WinDLL('kernel32', use_last_error=True).GetFileAttributesW
+        func.argtypes = [wintypes.LPCWSTR]
+        func.restype = wintypes.DWORD
+        _get_file_attributes = func
+
+    return _get_file_attributes(path)
+
+
+def read_json(filepath: str, default: Any = None) -> Any:
+    """
+    Đọc file JSON.
+
+    Args:
+        filepath: Đường dẫn đến file JSON
+        default: Giá trị mặc định nếu đọc thất bại
+
+    Returns:
+        Dữ liệu đã parse hoặc giá trị mặc định
+    """
+    return safe_json_load(filepath, default)
+
+
+def write_json(filepath: str, data: Any, indent: int = 4) -> bool:
+    """
+    Ghi dữ liệu vào file JSON.
+
+    Args:
+        filepath: Đường dẫn đến file JSON
+        data: Dữ liệu cần ghi
+        indent: Số spaces để indent
+
+    Returns:
+        True nếu ghi thành công
+    """
+    return safe_json_save(filepath, data, indent)
+
+
+def file_exists(filepath: str) -> bool:
+    """
+    Kiểm tra file có tồn tại không.
+
+    Args:
+        filepath: Đường dẫn đến file
+
+    Returns:
+        True nếu file tồn tại
+    """
+    attrs = _win_attrs(filepath)
+    if attrs is None:
+        return os.path.isfile(filepath)
+    return attrs != _INVALID_FILE_ATTRIBUTES and not attrs & _FILE_ATTRIBUTE_DIRECTORY
+
+
+def folder_exists(folderpath: str) -> bool:
+    """
+    Kiểm tra folder có tồn tại không.
+
+    Args:
+        folderpath: Đường dẫn đến folder
+
+    Returns:
+        True nếu folder tồn tại
+    """
+    attrs = _win_attrs(folderpath)
+    if attrs is None:
+        return os.path.isdir(folderpath)
+    return attrs != _INVALID_FILE_ATTRIBUTES and bool(attrs & _FILE_ATTRIBUTE_DIRECTORY)
+
+
+def create_folder(folderpath: str) -> bool:
+    """
+    Tạo folder nếu chưa tồn tại.
+
+    Args:
+        folderpath: Đường dẫn đến folder
+
+    Returns:
+        True nếu tạo thành công hoặc đã tồn tại
+    """
+    return ensure_directory(folderpath)
+
+
+def scan_folders(parent_path: str) -> List[os.DirEntry]:
+    """
+    Liệt kê các folder con dưới dạng DirEntry.
+
+    DirEntry giữ sẵn thông tin lấy được khi đọc thư mục (loại entry,
+    và trên Windows cả stat), caller có thể dùng lại mà không cần
+    gọi os.stat thêm lần nữa.
+
+    Args:
+        parent_path: Đường dẫn đến folder cha
+
+    Returns:
+        Danh sách DirEntry của các folder con
+    """
+    try:
+        with os.scandir(parent_path) as it:
+            return [entry for entry in it if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    except OSError as e:
+        logger.warning("Lỗi đọc thư mục %s: %s", parent_path, e)
+        return []
+
+
+def list_folders(parent_path: str) -> List[str]:
+    """
+    Liệt kê các folder con trong một folder.
+
+    Args:
+        parent_path: Đường dẫn đến folder cha
+
+    Returns:
+        Danh sách đường dẫn các folder con
+    """
+    return [entry.path for entry in scan_folders(parent_path)]
+
+
+def list_files(folder_path: str, extension: Optional[str] = None) -> List[str]:
+    """
+    Liệt kê các file trong một folder.
+
+    Args:
+        folder_path: Đường dẫn đến folder
+        extension: Lọc theo đuôi file (vd: ".json")
+
+    Returns:
+        Danh sách đường dẫn các file
+    """
+    try:
+        with os.scandir(folder_path) as it:
+            return [
+                entry.path for entry in it
+                if (extension is None or entry.name.endswith(extension))
+                and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    except OSError as e:
+        logger.warning("Lỗi đọc thư mục %s: %s", folder_path, e)
+        return []
+
+
+def get_file_size(filepath: str) -> int:
+    """
+    Lấy kích thước file.
+
+    Args:
+        filepath: Đường dẫn đến file
+
+    Returns:
+        Kích thước file tính bằng bytes, -1 nếu lỗi
+    """
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return -1
+
+
+def copy_file(src: str, dst: str) -> bool:
+    """
+    Copy file.
+
+    Args:
+        src: Đường dẫn file nguồn
+        dst: Đường dẫn file đích
+
+    Returns:
+        True nếu copy thành công
+    """
+    try:
+        shutil.copy2(src, dst)
+        return True
+    except OSError as e:
+        logger.warning("Lỗi copy file %s -> %s: %s", src, dst, e)
+        return False
+
+
+def delete_file(filepath: str) -> bool:
+    """
+    Xóa file.
+
+    Args:
+        filepath: Đường dẫn đến file
+
+    Returns:
+        True nếu xóa thành công
+    """
+    try:
+        if os.path.isfile(filepath):
+            os.remove(filepath)
+        return True
+    except OSError as e:
+        logger.warning("Lỗi xóa file %s: %s", filepath, e)
+        return False
+
+
+def get_absolute_path(path: str) -> str:
+    """
+    Chuyển đổi thành đường dẫn tuyệt đối.
+
+    Args:
+        path: Đường dẫn cần chuyển đổi
+
+    Returns:
+        Đường dẫn tuyệt đối
+    """
+    return os.path.abspath(path)
+
+
+def join_paths(*paths: str) -> str:
+    """
+    Nối các phần đường dẫn.
+
+    Args:
+        *paths: Các phần đường dẫn
+
+    Returns:
+        Đường dẫn đã nối
+    """
+    return os.path.join(*paths)
+
+
+def get_parent_folder(path: str) -> str:
+    """
+    Lấy folder cha của đường dẫn.
+
+    Args:
+        path: Đường dẫn cần lấy folder cha
+
+    Returns:
+        Đường dẫn folder cha
+    """
+    return os.path.dirname(path)
+
+
+def get_filename(path: str, include_extension: bool = True) -> str:
+    """
+    Lấy tên file từ đường dẫn.
+
+    Args:
+        path: Đường dẫn đến file
+        include_extension: Có bao gồm đuôi file không
+
+    Returns:
+        Tên file
+    """
+    filename = os.path.basename(path)
+    if not include_extension:
+        filename = os.path.splitext(filename)[0]
+    return filename
+
 
 class FileService:
     """
@@ -27,232 +312,19 @@ class FileService:
         """Khởi tạo FileService."""
         pass
 
-    @staticmethod
-    def read_json(filepath: str, default: Any = None) -> Any:
-        """
-        Đọc file JSON.
-
-        Args:
-            filepath: Đường dẫn đến file JSON
-            default: Giá trị mặc định nếu đọc thất bại
-
-        Returns:
-            Dữ liệu đã parse hoặc giá trị mặc định
-        """
-        return safe_json_load(filepath, default)
-
-    @staticmethod
-    def write_json(filepath: str, data: Any, indent: int = 4) -> bool:
-        """
-        Ghi dữ liệu vào file JSON.
-
-        Args:
-            filepath: Đường dẫn đến file JSON
-            data: Dữ liệu cần ghi
-            indent: Số spaces để indent
-
-        Returns:
-            True nếu ghi thành công
-        """
-        return safe_json_save(filepath, data, indent)
-
-    @staticmethod
-    def file_exists(filepath: str) -> bool:
-        """
-        Kiểm tra file có tồn tại không.
-
-        Args:
-            filepath: Đường dẫn đến file
-
-        Returns:
-            True nếu file tồn tại
-        """
-        return os.path.isfile(filepath)
-
-    @staticmethod
-    def folder_exists(folderpath: str) -> bool:
-        """
-        Kiểm tra folder có tồn tại không.
-
-        Args:
-            folderpath: Đường dẫn đến folder
-
-        Returns:
-            True nếu folder tồn tại
-        """
-        return os.path.isdir(folderpath)
-
-    @staticmethod
-    def create_folder(folderpath: str) -> bool:
-        """
-        Tạo folder nếu chưa tồn tại.
-
-        Args:
-            folderpath: Đường dẫn đến folder
-
-        Returns:
-            True nếu tạo thành công hoặc đã tồn tại
-        """
-        return ensure_directory(folderpath)
-
-    @staticmethod
-    def list_folders(parent_path: str) -> List[str]:
-        """
-        Liệt kê các folder con trong một folder.
-
-        Args:
-            parent_path: Đường dẫn đến folder cha
-
-        Returns:
-            Danh sách đường dẫn các folder con
-        """
-        if not os.path.isdir(parent_path):
-            return []
-
-        folders = []
-        try:
-            for item in os.listdir(parent_path):
-                item_path = os.path.join(parent_path, item)
-                if os.path.isdir(item_path):
-                    folders.append(item_path)
-        except OSError as e:
-            print(f"Lỗi đọc thư mục {parent_path}: {e}")
-
-        return folders
-
-    @staticmethod
-    def list_files(folder_path: str, extension: Optional[str] = None) -> List[str]:
-        """
-        Liệt kê các file trong một folder.
-
-        Args:
-            folder_path: Đường dẫn đến folder
-            extension: Lọc theo đuôi file (vd: ".json")
-
-        Returns:
-            Danh sách đường dẫn các file
-        """
-        if not os.path.isdir(folder_path):
-            return []
-
-        files = []
-        try:
-            for item in os.listdir(folder_path):
-                item_path = os.path.join(folder_path, item)
-                if os.path.isfile(item_path):
-                    if extension is None or item.endswith(extension):
-                        files.append(item_path)
-        except OSError as e:
-            print(f"Lỗi đọc thư mục {folder_path}: {e}")
-
-        return files
-
-    @staticmethod
-    def get_file_size(filepath: str) -> int:
-        """
-        Lấy kích thước file.
-
-        Args:
-            filepath: Đường dẫn đến file
-
-        Returns:
-            Kích thước file tính bằng bytes, -1 nếu lỗi
-        """
-        try:
-            return os.path.getsize(filepath)
-        except OSError:
-            return -1
-
-    @staticmethod
-    def copy_file(src: str, dst: str) -> bool:
-        """
-        Copy file.
-
-        Args:
-            src: Đường dẫn file nguồn
-            dst: Đường dẫn file đích
-
-        Returns:
-            True nếu copy thành công
-        """
-        try:
-            shutil.copy2(src, dst)
-            return True
-        except OSError as e:
-            print(f"Lỗi copy file {src} -> {dst}: {e}")
-            return False
-
-    @staticmethod
-    def delete_file(filepath: str) -> bool:
-        """
-        Xóa file.
-
-        Args:
-            filepath: Đường dẫn đến file
-
-        Returns:
-            True nếu xóa thành công
-        """
-        try:
-            if os.path.isfile(filepath):
-                os.remove(filepath)
-            return True
-        except OSError as e:
-            print(f"Lỗi xóa file {filepath}: {e}")
-            return False
-
-    @staticmethod
-    def get_absolute_path(path: str) -> str:
-        """
-        Chuyển đổi thành đường dẫn tuyệt đối.
-
-        Args:
-            path: Đường dẫn cần chuyển đổi
-
-        Returns:
-            Đường dẫn tuyệt đối
-        """
-        return os.path.abspath(path)
-
-    @staticmethod
-    def join_paths(*paths: str) -> str:
-        """
-        Nối các phần đường dẫn.
-
-        Args:
-            *paths: Các phần đường dẫn
-
-        Returns:
-            Đường dẫn đã nối
-        """
-        return os.path.join(*paths)
-
-    @staticmethod
-    def get_parent_folder(path: str) -> str:
-        """
-        Lấy folder cha của đường dẫn.
-
-        Args:
-            path: Đường dẫn cần lấy folder cha
-
-        Returns:
-            Đường dẫn folder cha
-        """
-        return os.path.dirname(path)
-
-    @staticmethod
-    def get_filename(path: str, include_extension: bool = True) -> str:
-        """
-        Lấy tên file từ đường dẫn.
-
-        Args:
-            path: Đường dẫn đến file
-            include_extension: Có bao gồm đuôi file không
-
-        Returns:
-            Tên file
-        """
-        filename = os.path.basename(path)
-        if not include_extension:
-            filename = os.path.splitext(filename)[0]
-        return filename
+    # Giữ API dạng class cho code cũ, các method trỏ thẳng tới hàm module
+    read_json = staticmethod(read_json)
+    write_json = staticmethod(write_json)
+    file_exists = staticmethod(file_exists)
+    folder_exists = staticmethod(folder_exists)
+    create_folder = staticmethod(create_folder)
+    scan_folders = staticmethod(scan_folders)
+    list_folders = staticmethod(list_folders)
+    list_files = staticmethod(list_files)
+    get_file_size = staticmethod(get_file_size)
+    copy_file = staticmethod(copy_file)
+    delete_file = staticmethod(delete_file)
+    get_absolute_path = staticmethod(get_absolute_path)
+    join_paths = staticmethod(join_paths)
+    get_parent_folder = staticmethod(get_parent_folder)
+    get_filename = staticmethod(get_filename)
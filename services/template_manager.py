@@ -9,11 +9,20 @@ Service này cung cấp:
 """
 
 import os
+import sys
+import time
+import logging
 import json
 import shutil
-from typing import Optional, Dict, List, Tuple
+import struct
+import types
+from typing import Optional, Dict, List, Tuple, Mapping
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, replace
+from utils.helpers import loads_json, dumps_json
 
 try:
     import cv2
@@ -22,8 +31,81 @@ try:
 except ImportError:
     CV2_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# VisionService được import lần đầu khi cần (tránh import vòng và chi phí lúc load)
+_VisionService = None
+
+# Trạng thái thư viện phụ thuộc không đổi sau khi import (chỉ đọc)
+_DEPENDENCIES = types.MappingProxyType({'opencv': CV2_AVAILABLE})
+
+# dataclass(slots=True) chỉ có từ Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Các field được serialize trong to_dict (không gồm ảnh đã decode)
+_DICT_FIELDS = (
+    'name', 'path', 'category', 'version',
+    'description', 'width', 'height', 'created_at'
+)
+
+# PNG signature và vị trí chunk IHDR (chứa width/height) trong header
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_HEADER_SIZE = 24
+
+
+def _read_png_size(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Đọc kích thước ảnh PNG từ header (chunk IHDR) mà không decode ảnh.
+
+    Args:
+        path: Đường dẫn file PNG
+
+    Returns:
+        Tuple (width, height) hoặc None nếu không phải PNG hợp lệ
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(_PNG_HEADER_SIZE)
+    except OSError:
+        return None
+
+    if (len(header) < _PNG_HEADER_SIZE
+            or header[:8] != _PNG_SIGNATURE
+            or header[12:16] != b'IHDR'):
+        return None
+
+    return struct.unpack('>II', header[16:24])
+
+
+# Thư mục hệ thống không phải category
+_SKIP_CATEGORY_DIRS = frozenset({'__pycache__'})
+
+# Pool dùng chung để scandir song song các thư mục category khi liệt kê
+# tất cả templates (thread chỉ được tạo khi có việc)
+_SCAN_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix='template-scan')
+
+
+def _scan_png_files(folder: str) -> List[os.DirEntry]:
+    """
+    Liệt kê các file .png trong thư mục, loại entry lấy từ DirEntry không cần stat thêm.
+
+    Args:
+        folder: Đường dẫn thư mục category
+
+    Returns:
+        Danh sách DirEntry, rỗng nếu không đọc được thư mục
+    """
+    try:
+        with os.scandir(folder) as it:
+            return [
+                entry for entry in it
+                if entry.name.endswith('.png') and entry.is_file()
+            ]
+    except OSError:
+        return []
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Template:
     """
     Model đại diện cho một template image.
@@ -37,6 +119,8 @@ class Template:
         width: Chiều rộng template
         height: Chiều cao template
         created_at: Thời gian tạo
+        image: Ảnh BGR đã decode (chỉ có khi load với load_image=True)
+        gray: Ảnh grayscale tương ứng với image
     """
     name: str
     path: str
@@ -46,10 +130,12 @@ class Template:
     width: int = 0
     height: int = 0
     created_at: str = ""
+    image: Optional['np.ndarray'] = field(default=None, repr=False, compare=False)
+    gray: Optional['np.ndarray'] = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> Dict:
-        """Chuyển đổi thành dictionary."""
-        return asdict(self)
+        """Chuyển đổi thành dictionary (không gồm dữ liệu ảnh)."""
+        return {name: getattr(self, name) for name in _DICT_FIELDS}
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Template':
@@ -77,6 +163,22 @@ class TemplateManager:
     # File metadata
     METADATA_FILE = "templates.json"
 
+    # Các category mặc định
+    DEFAULT_CATEGORIES = ('buttons', 'icons', 'status')
+
+    # Cache metadata dùng chung giữa các instance:
+    # metadata_path -> ((st_mtime_ns, st_size), metadata)
+    _metadata_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Dict]]] = {}
+
+    # Số template tối đa giữ trong cache (LRU)
+    CACHE_MAX_SIZE = 256
+
+    # Tổng số pixel ảnh đã decode được giữ trong cache
+    IMAGE_CACHE_MAX_PIXELS = 16_000_000
+
+    # Thời gian (giây) nhớ các lần không tìm thấy template trên disk
+    MISS_CACHE_TTL = 5.0
+
     def __init__(self, template_dir: Optional[str] = None):
         """
         Khởi tạo TemplateManager.
@@ -87,23 +189,63 @@ class TemplateManager:
         self.template_dir = template_dir or self.DEFAULT_TEMPLATE_DIR
         self.metadata_path = os.path.join(self.template_dir, self.METADATA_FILE)
 
-        # Cache templates đã load
-        self._cache: Dict[str, Template] = {}
+        # Cache LRU các template đã load: (category, name, version) -> Template
+        self._cache: 'OrderedDict[Tuple[str, str, str], Template]' = OrderedDict()
+        self._image_pixels = 0
+
+        # Các file template không tìm thấy: (category, tên file không đuôi) -> thời điểm hết hạn
+        self._miss_cache: Dict[Tuple[str, str], float] = {}
+
+        # Đường dẫn thư mục của từng category, tính một lần
+        self._cat_paths: Dict[str, str] = {
+            cat: os.path.join(self.template_dir, cat) for cat in self.DEFAULT_CATEGORIES
+        }
 
         # Đảm bảo thư mục tồn tại
         self._ensure_directories()
 
+        # Index file template: (category, tên file không đuôi) -> đường dẫn
+        self._index: Dict[Tuple[str, str], str] = {}
+        self._build_index()
+
         # Load metadata
         self.metadata = self._load_metadata()
 
+        # Metadata đã sửa nhưng chưa ghi file (trong batch())
+        self._dirty = False
+        self._batch_depth = 0
+
     def _ensure_directories(self) -> None:
         """Đảm bảo các thư mục con tồn tại."""
-        categories = ['buttons', 'icons', 'status']
-        for category in categories:
-            path = os.path.join(self.template_dir, category)
+        for path in self._cat_paths.values():
             if not os.path.exists(path):
                 os.makedirs(path, exist_ok=True)
 
+    def _cat_path(self, category: str) -> str:
+        """Lấy đường dẫn thư mục category (memoize cả category tùy chỉnh)."""
+        path = self._cat_paths.get(category)
+        if path is None:
+            path = self._cat_paths[category] = os.path.join(self.template_dir, category)
+        return path
+
+    def _build_index(self) -> None:
+        """Quét thư mục templates một lần để index các file .png theo category."""
+        index = {}
+
+        try:
+            with os.scandir(self.template_dir) as it:
+                category_entries = [entry for entry in it if entry.is_dir()]
+        except OSError:
+            category_entries = []
+
+        # Các thư mục category được scandir song song
+        scanned = _SCAN_EXECUTOR.map(_scan_png_files, [e.path for e in category_entries])
+        for cat_entry, entries in zip(category_entries, scanned):
+            for entry in entries:
+                index[(cat_entry.name, entry.name[:-4])] = entry.path
+
+        self._index = index
+
     def _load_metadata(self) -> Dict[str, Dict]:
         """
         Load metadata từ file JSON.
@@ -111,16 +253,27 @@ class TemplateManager:
         Returns:
             Dictionary chứa metadata của templates
         """
-        if not os.path.exists(self.metadata_path):
+        try:
+            st = os.stat(self.metadata_path)
+        except OSError:
             return {}
 
+        # File chưa thay đổi từ lần parse trước: dùng lại kết quả
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._metadata_cache.get(self.metadata_path)
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+
         try:
-            with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.metadata_path, 'rb') as f:
+                metadata = loads_json(f.read())
         except (json.JSONDecodeError, OSError) as e:
-            print(f"Lỗi load metadata: {e}")
+            logger.warning("Lỗi load metadata: %s", e)
             return {}
 
+        self._metadata_cache[self.metadata_path] = (key, metadata)
+        return dict(metadata)
+
     def _save_metadata(self) -> bool:
         """
         Lưu metadata vào file JSON.
@@ -129,13 +282,60 @@ class TemplateManager:
             True nếu lưu thành công
         """
         try:
-            with open(self.metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(self.metadata, f, indent=4, ensure_ascii=False)
+            # JSON dạng gọn (orjson nếu có), ghi bytes một lần vào file tạm rồi
+            # thay thế atomically: crash giữa chừng không để lại file hỏng
+            tmp_path = self.metadata_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps_json(self.metadata))
+            os.replace(tmp_path, self.metadata_path)
+
+            # Cập nhật cache theo stat mới để instance khác không phải parse lại
+            st = os.stat(self.metadata_path)
+            self._metadata_cache[self.metadata_path] = (
+                (st.st_mtime_ns, st.st_size), dict(self.metadata)
+            )
             return True
         except OSError as e:
-            print(f"Lỗi lưu metadata: {e}")
+            logger.warning("Lỗi lưu metadata: %s", e)
             return False
 
+    def _mark_dirty(self) -> None:
+        """Đánh dấu metadata đã thay đổi, ghi file ngay nếu không trong batch()."""
+        self._dirty = True
+        if not self._batch_depth:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Ghi metadata xuống file nếu có thay đổi chưa lưu.
+
+        Returns:
+            True nếu không có gì cần ghi hoặc ghi thành công
+        """
+        if not self._dirty:
+            return True
+
+        if self._save_metadata():
+            self._dirty = False
+            return True
+        return False
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager gom nhiều thao tác add/delete, chỉ ghi metadata một lần khi thoát.
+
+        Yields:
+            TemplateManager (chính instance này)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
     def get_template_path(
         self,
         name: str,
@@ -153,26 +353,71 @@ class TemplateManager:
         Returns:
             Đường dẫn đầy đủ đến template hoặc None nếu không tìm thấy
         """
-        # Thử với version cụ thể trước
-        if version != "default":
-            filename = f"{name}_{version}.png"
-            path = os.path.join(self.template_dir, category, filename)
+        index = self._index
+        miss_cache = self._miss_cache
+        cat_path = None
+        now = None
+
+        # Version cụ thể trước, sau đó mới đến default version. Hit trong index
+        # được tin luôn (add/delete_template giữ index đồng bộ); file bị xóa từ
+        # bên ngoài được bỏ khỏi index khi get_template không đọc được file
+        stems = [f"{name}_{version}", name] if version != "default" else [name]
+        for stem in stems:
+            key = (category, stem)
+
+            path = index.get(key)
+            if path:
+                return path
+
+            # Vừa kiểm tra disk mà không thấy thì không stat lại
+            expires = miss_cache.get(key)
+            if expires is not None:
+                if now is None:
+                    now = time.monotonic()
+                if expires > now:
+                    continue
+                del miss_cache[key]
+
+            # Không có trong index: kiểm tra disk (file được thêm từ bên ngoài)
+            if cat_path is None:
+                cat_path = self._cat_path(category)
+            path = os.path.join(cat_path, f"{stem}.png")
             if os.path.exists(path):
+                index[key] = path
                 return path
 
-        # Fallback sang default version
-        filename = f"{name}.png"
-        path = os.path.join(self.template_dir, category, filename)
-        if os.path.exists(path):
-            return path
+            if now is None:
+                now = time.monotonic()
+            miss_cache[key] = now + self.MISS_CACHE_TTL
 
         return None
 
+    def _drop_stale_path(self, category: str, path: str) -> bool:
+        """
+        Bỏ entry index của file đã bị xóa từ bên ngoài manager.
+
+        Args:
+            category: Loại template
+            path: Đường dẫn lấy từ index
+
+        Returns:
+            True nếu file không còn và entry đã được bỏ
+        """
+        if os.path.exists(path):
+            return False
+
+        key = (category, os.path.basename(path)[:-4])
+        if self._index.get(key) != path:
+            return False
+        del self._index[key]
+        return True
+
     def get_template(
         self,
         name: str,
         category: str = "buttons",
-        version: str = "default"
+        version: str = "default",
+        load_image: bool = False
     ) -> Optional[Template]:
         """
         Lấy template object.
@@ -181,30 +426,108 @@ class TemplateManager:
             name: Tên template
             category: Loại template
             version: Phiên bản
+            load_image: Decode sẵn ảnh (BGR và grayscale) vào template.image
+                và template.gray, được cache để lần sau không phải decode lại
 
         Returns:
             Template object hoặc None nếu không tìm thấy
         """
-        cache_key = f"{category}/{name}_{version}"
+        cache_key = (category, name, version)
 
         # Kiểm tra cache
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        template = self._cache_get(cache_key)
 
-        # Lấy đường dẫn
-        path = self.get_template_path(name, category, version)
-        if not path:
-            return None
+        if template is None:
+            # Lấy đường dẫn
+            path = self.get_template_path(name, category, version)
+            if not path:
+                return None
 
-        # Tạo Template object
-        template = self._create_template_from_file(path, name, category, version)
+            # Tạo Template object
+            template = self._create_template_from_file(path, name, category, version)
+            if not template:
+                # File trong index đã bị xóa: tra lại (version khác hoặc disk)
+                if self._drop_stale_path(category, path):
+                    return self.get_template(name, category, version, load_image)
+                return None
 
-        # Cache lại
-        if template:
-            self._cache[cache_key] = template
+            # Cache lại
+            self._cache_put(cache_key, template)
+
+        if load_image and template.image is None:
+            return self._load_template_image(cache_key, template)
 
         return template
 
+    def _load_template_image(
+        self,
+        key: Tuple[str, str, str],
+        template: Template
+    ) -> Template:
+        """
+        Decode ảnh của template và giữ trong cache theo ngân sách pixel.
+
+        Khi vượt IMAGE_CACHE_MAX_PIXELS, ảnh của các template ít dùng nhất
+        được giải phóng trước. Nếu vẫn không đủ chỗ, trả về bản sao có ảnh
+        nhưng không cache.
+
+        Args:
+            key: Key của template trong cache
+            template: Template đã nằm trong cache
+
+        Returns:
+            Template có image và gray (nếu decode được)
+        """
+        if not CV2_AVAILABLE:
+            return template
+
+        image = cv2.imread(template.path)
+        if image is None:
+            return template
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        pixels = image.shape[0] * image.shape[1]
+
+        # Giải phóng ảnh của các template ít dùng nhất cho đến khi đủ chỗ
+        for other_key, other in list(self._cache.items()):
+            if self._image_pixels + pixels <= self.IMAGE_CACHE_MAX_PIXELS:
+                break
+            if other_key != key and other.image is not None:
+                self._release_image(other)
+                self._cache[other_key] = replace(other, image=None, gray=None)
+
+        loaded = replace(template, image=image, gray=gray)
+        if self._image_pixels + pixels <= self.IMAGE_CACHE_MAX_PIXELS:
+            self._cache[key] = loaded
+            self._image_pixels += pixels
+        return loaded
+
+    def _release_image(self, template: Template) -> None:
+        """Trả lại ngân sách pixel của ảnh template sắp bị bỏ khỏi cache."""
+        if template.image is not None:
+            self._image_pixels -= template.image.shape[0] * template.image.shape[1]
+
+    def _cache_pop(self, key: Tuple[str, str, str]) -> None:
+        """Xóa template khỏi cache (nếu có)."""
+        template = self._cache.pop(key, None)
+        if template is not None:
+            self._release_image(template)
+
+    def _cache_get(self, key: Tuple[str, str, str]) -> Optional[Template]:
+        """Lấy template từ cache và đánh dấu vừa dùng."""
+        template = self._cache.get(key)
+        if template is not None:
+            self._cache.move_to_end(key)
+        return template
+
+    def _cache_put(self, key: Tuple[str, str, str], template: Template) -> None:
+        """Thêm template vào cache, bỏ template ít dùng nhất khi vượt giới hạn."""
+        self._cache[key] = template
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_MAX_SIZE:
+            _, evicted = self._cache.popitem(last=False)
+            self._release_image(evicted)
+
     def _create_template_from_file(
         self,
         path: str,
@@ -224,16 +547,19 @@ class TemplateManager:
         Returns:
             Template object hoặc None
         """
-        if not CV2_AVAILABLE:
-            return Template(name=name, path=path, category=category, version=version)
-
         try:
-            # Đọc image để lấy kích thước
-            img = cv2.imread(path)
-            if img is None:
-                return None
-
-            h, w = img.shape[:2]
+            # Lấy kích thước từ PNG header, chỉ decode ảnh khi không phải PNG
+            size = _read_png_size(path)
+            if size is not None:
+                w, h = size
+            elif CV2_AVAILABLE:
+                # Chỉ cần kích thước: đọc nguyên bản, bỏ qua bước chuyển màu sang BGR
+                img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+                if img is None:
+                    return None
+                h, w = img.shape[:2]
+            else:
+                return Template(name=name, path=path, category=category, version=version)
 
             # Lấy metadata từ file nếu có
             template_id = f"{category}/{name}_{version}"
@@ -251,7 +577,7 @@ class TemplateManager:
             )
 
         except Exception as e:
-            print(f"Lỗi tạo template từ file: {e}")
+            logger.warning("Lỗi tạo template từ file: %s", e)
             return None
 
     def list_templates(
@@ -270,61 +596,96 @@ class TemplateManager:
             Danh sách Template objects
         """
         templates = []
-        categories = [category] if category else ['buttons', 'icons', 'status']
-
-        for cat in categories:
-            cat_path = os.path.join(self.template_dir, cat)
-            if not os.path.exists(cat_path):
-                continue
-
-            # Liệt kê các file .png
-            for filename in os.listdir(cat_path):
-                if not filename.endswith('.png'):
-                    continue
-
-                # Parse tên và version
-                name_parts = filename[:-4].split('_')
-                if len(name_parts) > 1:
-                    tpl_name = '_'.join(name_parts[:-1])
-                    tpl_version = name_parts[-1]
+        categories = [category] if category else self.DEFAULT_CATEGORIES
+        cat_paths = [self._cat_path(cat) for cat in categories]
+
+        # Nhiều category thì scandir song song để các syscall chồng lên nhau
+        if len(cat_paths) > 1:
+            scanned = list(_SCAN_EXECUTOR.map(_scan_png_files, cat_paths))
+        else:
+            scanned = [_scan_png_files(path) for path in cat_paths]
+
+        for cat, entries in zip(categories, scanned):
+            for entry in entries:
+                # Parse tên và version: phần sau dấu "_" cuối cùng là version
+                stem = entry.name[:-4]
+                parts = stem.rsplit('_', 1)
+                if len(parts) == 2:
+                    tpl_name, tpl_version = parts
                 else:
-                    tpl_name = name_parts[0]
-                    tpl_version = 'default'
+                    tpl_name, tpl_version = stem, 'default'
 
                 # Lọc theo version nếu có
                 if version and tpl_version != version:
                     continue
 
-                # Lấy template
-                template = self.get_template(tpl_name, cat, tpl_version)
+                # Lấy template trực tiếp từ file đã liệt kê
+                template = self._create_template_from_entry(entry, tpl_name, cat, tpl_version)
                 if template:
                     templates.append(template)
 
         return templates
 
+    def _create_template_from_entry(
+        self,
+        entry: os.DirEntry,
+        name: str,
+        category: str,
+        version: str
+    ) -> Optional[Template]:
+        """
+        Lấy Template từ DirEntry đã liệt kê, dùng cache nếu có.
+
+        Đường dẫn lấy thẳng từ entry nên không cần kiểm tra tồn tại
+        lại như get_template_path.
+
+        Args:
+            entry: DirEntry của file template
+            name: Tên template
+            category: Loại
+            version: Phiên bản
+
+        Returns:
+            Template object hoặc None
+        """
+        cache_key = (category, name, version)
+        template = self._cache_get(cache_key)
+        if template is not None:
+            return template
+
+        template = self._create_template_from_file(entry.path, name, category, version)
+        if template:
+            self._cache_put(cache_key, template)
+
+        return template
+
     def add_template(
         self,
-        source_path: str,
+        source_path: Optional[str],
         name: str,
         category: str = "buttons",
         version: str = "default",
-        description: str = ""
+        description: str = "",
+        image: Optional['np.ndarray'] = None,
+        compression_level: int = 1
     ) -> bool:
         """
-        Thêm template mới từ file image.
+        Thêm template mới từ file image hoặc ảnh trong bộ nhớ.
 
         Args:
-            source_path: Đường dẫn file image nguồn
+            source_path: Đường dẫn file image nguồn (bỏ qua nếu có image)
             name: Tên template
             category: Loại template
             version: Phiên bản
             description: Mô tả
+            image: Ảnh BGR, ghi thẳng vào thư mục templates (tùy chọn)
+            compression_level: Mức nén PNG 0-9 khi ghi image (thấp = ghi nhanh hơn)
 
         Returns:
             True nếu thêm thành công
         """
-        if not os.path.exists(source_path):
-            print(f"File nguồn không tồn tại: {source_path}")
+        if image is None and not (source_path and os.path.exists(source_path)):
+            logger.warning("File nguồn không tồn tại: %s", source_path)
             return False
 
         try:
@@ -334,10 +695,24 @@ class TemplateManager:
             else:
                 filename = f"{name}.png"
 
-            dest_path = os.path.join(self.template_dir, category, filename)
+            dest_path = os.path.join(self._cat_path(category), filename)
+
+            # Ghi ảnh trực tiếp hoặc copy file nguồn
+            if image is not None:
+                ok, buf = cv2.imencode(
+                    '.png', image, [cv2.IMWRITE_PNG_COMPRESSION, compression_level]
+                )
+                if not ok:
+                    logger.warning("Không thể encode template: %s", name)
+                    return False
+                with open(dest_path, 'wb') as f:
+                    f.write(buf.tobytes())
+            else:
+                shutil.copy2(source_path, dest_path)
+            self._index[(category, filename[:-4])] = dest_path
 
-            # Copy file
-            shutil.copy2(source_path, dest_path)
+            # Template mới có thể là default của các version đang bị nhớ là miss
+            self._miss_cache.clear()
 
             # Lưu metadata
             template_id = f"{category}/{name}_{version}"
@@ -349,18 +724,16 @@ class TemplateManager:
                 'created_at': datetime.now().isoformat()
             }
 
-            self._save_metadata()
+            self._mark_dirty()
 
             # Xóa cache nếu có
-            cache_key = f"{category}/{name}_{version}"
-            if cache_key in self._cache:
-                del self._cache[cache_key]
+            self._cache_pop((category, name, version))
 
-            print(f"Đã thêm template: {name} ({category}/{version})")
+            logger.info("Đã thêm template: %s (%s/%s)", name, category, version)
             return True
 
         except Exception as e:
-            print(f"Lỗi thêm template: {e}")
+            logger.warning("Lỗi thêm template: %s", e)
             return False
 
     def capture_template(
@@ -385,41 +758,30 @@ class TemplateManager:
             True nếu capture thành công
         """
         if not CV2_AVAILABLE:
-            print("opencv-python không khả dụng")
+            logger.warning("opencv-python không khả dụng")
             return False
 
         try:
-            # Import vision service để capture
-            from services.vision_service import VisionService
+            # Import vision service để capture (chỉ import lần đầu)
+            global _VisionService
+            if _VisionService is None:
+                from services.vision_service import VisionService as _VisionService
 
-            vision = VisionService()
-            screenshot = vision.capture_screenshot(region)
+            # with đóng backend chụp (mss/DXcam) ngay sau khi dùng
+            with _VisionService() as vision:
+                screenshot = vision.capture_screenshot(region)
 
             if screenshot is None:
-                print("Không thể chụp màn hình")
+                logger.warning("Không thể chụp màn hình")
                 return False
 
-            # Tạo tên file tạm
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                tmp_path = tmp.name
-
-            # Lưu screenshot tạm
-            cv2.imwrite(tmp_path, screenshot)
-
-            # Thêm template
-            result = self.add_template(tmp_path, name, category, version, description)
-
-            # Xóa file tạm
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
-
-            return result
+            # Ghi screenshot thẳng vào thư mục templates, không qua file tạm
+            return self.add_template(
+                None, name, category, version, description, image=screenshot
+            )
 
         except Exception as e:
-            print(f"Lỗi capture template: {e}")
+            logger.warning("Lỗi capture template: %s", e)
             return False
 
     def delete_template(
@@ -441,29 +803,28 @@ class TemplateManager:
         """
         path = self.get_template_path(name, category, version)
         if not path:
-            print(f"Template không tồn tại: {name}")
+            logger.warning("Template không tồn tại: %s", name)
             return False
 
         try:
             # Xóa file
             os.remove(path)
+            self._index.pop((category, os.path.basename(path)[:-4]), None)
 
             # Xóa metadata
             template_id = f"{category}/{name}_{version}"
             if template_id in self.metadata:
                 del self.metadata[template_id]
-                self._save_metadata()
+                self._mark_dirty()
 
             # Xóa cache
-            cache_key = f"{category}/{name}_{version}"
-            if cache_key in self._cache:
-                del self._cache[cache_key]
+            self._cache_pop((category, name, version))
 
-            print(f"Đã xóa template: {name}")
+            logger.info("Đã xóa template: %s", name)
             return True
 
         except Exception as e:
-            print(f"Lỗi xóa template: {e}")
+            logger.warning("Lỗi xóa template: %s", e)
             return False
 
     def validate_template(
@@ -500,21 +861,27 @@ class TemplateManager:
 
         result['exists'] = True
 
-        if not CV2_AVAILABLE:
+        # Kích thước đọc từ PNG header, không cần decode ảnh
+        size = _read_png_size(path)
+
+        if size is None and not CV2_AVAILABLE:
             result['errors'].append("opencv-python không khả dụng để validate")
             return result
 
         # Kiểm tra đọc được
         try:
-            img = cv2.imread(path)
-            if img is None:
-                result['errors'].append("Không thể đọc template image")
-                return result
+            if size is not None:
+                w, h = size
+            else:
+                img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+                if img is None:
+                    result['errors'].append("Không thể đọc template image")
+                    return result
+                h, w = img.shape[:2]
 
             result['readable'] = True
 
             # Kiểm tra kích thước hợp lệ
-            h, w = img.shape[:2]
             result['width'] = w
             result['height'] = h
 
@@ -537,25 +904,27 @@ class TemplateManager:
         Returns:
             Danh sách tên categories
         """
-        categories = []
-        for item in os.listdir(self.template_dir):
-            item_path = os.path.join(self.template_dir, item)
-            if os.path.isdir(item_path) and not item.startswith('.'):
-                categories.append(item)
-        return sorted(categories)
+        # Loại entry lấy từ DirEntry, không cần stat lại từng thư mục
+        with os.scandir(self.template_dir) as it:
+            return sorted(
+                entry.name for entry in it
+                if entry.name[:1] != '.'
+                and entry.name not in _SKIP_CATEGORY_DIRS
+                and entry.is_dir()
+            )
 
     def clear_cache(self) -> None:
         """Xóa cache templates."""
         self._cache.clear()
+        self._image_pixels = 0
+        self._miss_cache.clear()
 
     @staticmethod
-    def check_dependencies() -> dict:
+    def check_dependencies() -> Mapping[str, bool]:
         """
         Kiểm tra các thư viện phụ thuộc.
 
         Returns:
-            Dictionary với trạng thái các thư viện
+            Mapping chỉ đọc với trạng thái các thư viện
         """
-        return {
-            'opencv': CV2_AVAILABLE
-        }
+        return _DEPENDENCIES
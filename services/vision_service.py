@@ -10,12 +10,20 @@ Service này cung cấp các chức năng:
 
 import os
 import time
-from typing import Optional, Tuple, List
+import platform
+import hashlib
+import importlib.util
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, List, Dict
 from dataclasses import dataclass
 
 try:
-    import cv2
+    # numpy trước để kiểu trả về (np.recarray) vẫn dùng được khi thiếu cv2
     import numpy as np
+    import cv2
     CV2_AVAILABLE = True
 except ImportError:
     CV2_AVAILABLE = False
@@ -26,18 +34,69 @@ try:
 except ImportError:
     MSS_AVAILABLE = False
 
-try:
-    import pytesseract
-    from PIL import Image
-    PYTESSERACT_AVAILABLE = True
-except ImportError:
-    PYTESSERACT_AVAILABLE = False
+# Các module tùy chọn ít dùng (OCR, điều khiển chuột, DXcam) chỉ kiểm tra có
+# cài hay không qua find_spec; module thật được import ở lần dùng đầu tiên
+# (_lazy_import) để không làm chậm lúc khởi động ứng dụng
+def _module_available(name: str) -> bool:
+    """Kiểm tra module có cài đặt hay không mà không import nó."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-try:
-    import pyautogui
-    PYAUTOGUI_AVAILABLE = True
-except ImportError:
-    PYAUTOGUI_AVAILABLE = False
+
+# DXcam (DXGI Desktop Duplication) chỉ có trên Windows
+DXCAM_AVAILABLE = platform.system() == 'Windows' and _module_available('dxcam')
+PYTESSERACT_AVAILABLE = _module_available('pytesseract')
+TESSEROCR_AVAILABLE = _module_available('tesserocr')
+PYAUTOGUI_AVAILABLE = _module_available('pyautogui')
+
+_LAZY_MODULES: Dict[str, object] = {}
+
+
+def _lazy_import(name: str):
+    """
+    Import module tùy chọn ở lần dùng đầu tiên (kết quả được cache).
+
+    Args:
+        name: Tên module
+
+    Returns:
+        Module hoặc None nếu import lỗi (vd: pyautogui không có display)
+    """
+    if name not in _LAZY_MODULES:
+        try:
+            _LAZY_MODULES[name] = importlib.import_module(name)
+        except Exception as e:
+            print(f"Không import được {name}: {e}")
+            _LAZY_MODULES[name] = None
+    return _LAZY_MODULES[name]
+
+# Pool dùng chung để match nhiều template song song trên cùng một ảnh chụp
+# (OpenCV nhả GIL khi matchTemplate nên thread chạy song song thực sự)
+_MATCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='vision-match')
+
+
+@lru_cache(maxsize=32)
+def _region_monitor(x: int, y: int, width: int, height: int) -> Dict[str, int]:
+    """
+    Tạo monitor dict của mss cho vùng chụp (cache theo vùng, không được sửa).
+
+    Args:
+        x: Tọa độ x
+        y: Tọa độ y
+        width: Chiều rộng vùng
+        height: Chiều cao vùng
+
+    Returns:
+        Dictionary monitor cho mss.grab
+    """
+    return {
+        "top": y,
+        "left": x,
+        "width": width,
+        "height": height
+    }
 
 
 @dataclass
@@ -60,6 +119,25 @@ class MatchResult:
     width: int = 0
     height: int = 0
 
+    @classmethod
+    def from_record(cls, record) -> 'MatchResult':
+        """Tạo MatchResult từ một phần tử của mảng kết quả find_all_images_on_screen."""
+        return cls(
+            found=bool(record['found']),
+            x=int(record['x']),
+            y=int(record['y']),
+            confidence=float(record['confidence']),
+            width=int(record['width']),
+            height=int(record['height'])
+        )
+
+
+# Kiểu record cho nhiều kết quả tìm kiếm (struct-of-arrays), cùng tên field với MatchResult
+_MATCH_DTYPE = [
+    ('found', '?'), ('x', 'i4'), ('y', 'i4'),
+    ('confidence', 'f4'), ('width', 'i4'), ('height', 'i4')
+]
+
 
 class VisionService:
     """
@@ -72,11 +150,35 @@ class VisionService:
     - Click vào vị trí tìm được
     """
 
+    # Số buffer ảnh chụp tối đa giữ lại cho mỗi thread
+    MAX_CAPTURE_BUFFERS = 8
+
+    # Số template đã decode tối đa giữ trong cache (LRU)
+    TEMPLATE_CACHE_SIZE = 64
+
+    # Matching coarse-to-fine: số lần pyrDown, kích thước template tối thiểu,
+    # độ hạ ngưỡng ở mức thô, số ứng viên và lề vùng tinh chỉnh (pixel)
+    PYRAMID_LEVELS = 2
+    PYRAMID_MIN_TEMPLATE_SIZE = 32
+    PYRAMID_COARSE_MARGIN = 0.1
+    PYRAMID_CANDIDATES = 5
+    PYRAMID_REFINE_PAD = 8
+
+    # Poll thích ứng khi chờ: bắt đầu dày, giãn dần đến check_interval;
+    # match gần đạt ngưỡng (trong NEAR_MATCH_MARGIN) thì poll dày lại
+    POLL_MIN_INTERVAL = 0.05
+    POLL_BACKOFF = 1.5
+    NEAR_MATCH_MARGIN = 0.1
+
+    # Bước lấy mẫu pixel khi hash frame để phát hiện màn hình không đổi
+    FRAME_HASH_STEP = 4
+
     def __init__(
         self,
         confidence_threshold: float = 0.8,
         screenshot_on_error: bool = True,
-        screenshot_dir: str = "./screenshots"
+        screenshot_dir: str = "./screenshots",
+        use_gpu: bool = False
     ):
         """
         Khởi tạo VisionService.
@@ -85,11 +187,36 @@ class VisionService:
             confidence_threshold: Ngưỡng độ tin cậy mặc định (0.0 - 1.0)
             screenshot_on_error: Có chụp screenshot khi lỗi không
             screenshot_dir: Thư mục lưu screenshots
+            use_gpu: Chạy matchTemplate qua OpenCL (cv2.UMat) nếu máy hỗ trợ
         """
         self.confidence_threshold = confidence_threshold
         self.screenshot_on_error = screenshot_on_error
         self.screenshot_dir = screenshot_dir
 
+        # Instance mss dùng lại giữa các lần chụp (khởi tạo backend chỉ một lần);
+        # mss không thread-safe nên mọi truy cập đi qua lock
+        self._sct = None
+        self._sct_lock = threading.Lock()
+
+        # Backend chụp: DXcam trên Windows nếu có (độ trễ thấp hơn nhiều), còn lại mss
+        self._capture_backend = 'dxcam' if DXCAM_AVAILABLE else 'mss'
+        self._cam = None
+
+        # Buffer ảnh grayscale dùng lại giữa các lần chụp, riêng cho từng thread
+        self._local = threading.local()
+
+        # Cache LRU template đã decode:
+        # path -> [(st_mtime_ns, st_size), ảnh BGR, ảnh grayscale hoặc None]
+        self._templates: 'OrderedDict[str, list]' = OrderedDict()
+        self._templates_lock = threading.Lock()
+
+        # Template đã upload lên GPU: id(array) -> (array, UMat); giữ array để id không bị dùng lại
+        self._umats: 'OrderedDict[int, tuple]' = OrderedDict()
+
+        # Tesseract API (tesserocr) dùng lại giữa các lần OCR, theo ngôn ngữ
+        self._tess_apis: Dict[str, 'tesserocr.PyTessBaseAPI'] = {}
+        self._tess_lock = threading.Lock()
+
         # Tạo thư mục screenshots nếu cần
         if screenshot_on_error and not os.path.exists(screenshot_dir):
             os.makedirs(screenshot_dir, exist_ok=True)
@@ -97,55 +224,236 @@ class VisionService:
         # Kiểm tra dependencies
         self._check_dependencies()
 
+        # OpenCV dùng các nhân CPU (chừa một nhân cho UI) và bật code tối ưu
+        if CV2_AVAILABLE:
+            cv2.setUseOptimized(True)
+            cv2.setNumThreads(max(1, (os.cpu_count() or 2) - 1))
+
+        # OpenCL chỉ bật khi được yêu cầu và có thiết bị hỗ trợ
+        self.use_gpu = bool(use_gpu and CV2_AVAILABLE and cv2.ocl.haveOpenCL())
+        if self.use_gpu:
+            cv2.ocl.setUseOpenCL(True)
+
     def _check_dependencies(self) -> None:
         """Kiểm tra các thư viện phụ thuộc."""
         if not CV2_AVAILABLE:
             print("Warning: opencv-python không khả dụng")
         if not MSS_AVAILABLE:
             print("Warning: mss không khả dụng")
-        if not PYTESSERACT_AVAILABLE:
+        if not PYTESSERACT_AVAILABLE and not TESSEROCR_AVAILABLE:
             print("Warning: pytesseract không khả dụng (OCR sẽ không hoạt động)")
         if not PYAUTOGUI_AVAILABLE:
             print("Warning: pyautogui không khả dụng")
 
-    def capture_screenshot(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+    def capture_screenshot(
+        self,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        out: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
         """
         Chụp màn hình bằng mss (nhanh hơn PIL).
 
         Args:
             region: Vùng chụp (x, y, width, height). None = toàn màn hình
+            out: Array (H, W, 3) uint8 để ghi kết quả vào, tránh cấp phát mới
+                (bỏ qua nếu kích thước không khớp)
 
         Returns:
             Numpy array của ảnh (BGR format) hoặc None nếu thất bại
         """
-        if not MSS_AVAILABLE or not CV2_AVAILABLE:
+        bgra = self._capture_bgra(region)
+        if bgra is None:
             return None
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+
+    def _capture_gray(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        """
+        Chụp màn hình và chuyển thẳng BGRA -> grayscale, không qua ảnh BGR trung gian.
+
+        Args:
+            region: Vùng chụp (x, y, width, height). None = toàn màn hình
+
+        Ảnh trả về nằm trong buffer dùng lại của thread hiện tại, chỉ hợp lệ
+        đến lần chụp grayscale tiếp theo trên cùng thread.
+
+        Returns:
+            Ảnh grayscale hoặc None nếu thất bại
+        """
+        bgra = self._capture_bgra(region)
+        if bgra is None:
+            return None
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY, dst=self._gray_buffer(bgra.shape[:2]))
+
+    def _capture_if_changed(
+        self,
+        region: Optional[Tuple[int, int, int, int]],
+        last_digest: Optional[bytes],
+        step: Optional[int] = None
+    ) -> Tuple[Optional[np.ndarray], Optional[bytes]]:
+        """
+        Chụp grayscale, bỏ qua frame giống lần trước (so hash của ảnh lấy mẫu thưa).
+
+        Args:
+            region: Vùng chụp (x, y, width, height). None = toàn màn hình
+            last_digest: Hash của frame trước (None = chưa có)
+            step: Bước lấy mẫu pixel khi hash (None = FRAME_HASH_STEP, 1 = mọi pixel)
+
+        Returns:
+            Tuple (ảnh hoặc None nếu không chụp được/không đổi, hash của frame)
+        """
+        frame = self._capture_gray(region)
+        if frame is None:
+            return None, last_digest
+
+        # Mặc định hash 1/16 số pixel (bước 4 theo mỗi chiều), rẻ hơn nhiều so với matchTemplate
+        step = step or self.FRAME_HASH_STEP
+        sample = frame[::step, ::step] if step > 1 else frame
+        digest = hashlib.blake2b(sample.tobytes(), digest_size=8).digest()
+        if digest == last_digest:
+            return None, digest
+        return frame, digest
+
+    def _gray_buffer(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Lấy buffer grayscale theo kích thước cho thread hiện tại.
+
+        Args:
+            shape: Kích thước (H, W)
+
+        Returns:
+            Numpy array uint8 (H, W)
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+
+        buf = buffers.get(shape)
+        if buf is None:
+            # Giới hạn số buffer khi chụp nhiều vùng kích thước khác nhau
+            if len(buffers) >= self.MAX_CAPTURE_BUFFERS:
+                buffers.clear()
+            buf = buffers[shape] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def _capture_bgra(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        """
+        Chụp màn hình, trả về ảnh BGRA là view trên buffer của backend (không copy).
+
+        Args:
+            region: Vùng chụp (x, y, width, height). None = toàn màn hình
+
+        Returns:
+            Numpy array (H, W, 4) hoặc None nếu thất bại
+        """
+        if not CV2_AVAILABLE or not (MSS_AVAILABLE or DXCAM_AVAILABLE):
+            return None
+
+        with self._sct_lock:
+            if self._capture_backend == 'dxcam':
+                frame = self._grab_dxcam(region)
+                if frame is not None:
+                    return frame
+
+            if not MSS_AVAILABLE:
+                return None
+
+            try:
+                if self._sct is None:
+                    self._sct = mss.mss()
+                sct = self._sct
 
-        try:
-            with mss.mss() as sct:
                 if region:
-                    x, y, width, height = region
-                    monitor = {
-                        "top": y,
-                        "left": x,
-                        "width": width,
-                        "height": height
-                    }
+                    monitor = _region_monitor(*region)
                 else:
                     monitor = sct.monitors[1]  # Primary monitor
 
                 # Chụp màn hình
                 screenshot = sct.grab(monitor)
 
-                # Chuyển đổi sang numpy array (BGRA -> BGR)
-                img = np.array(screenshot)
-                img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+                # Bọc buffer BGRA của mss thành numpy array, không copy
+                return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+                    screenshot.height, screenshot.width, 4
+                )
+            except Exception as e:
+                print(f"Lỗi chụp màn hình: {e}")
+                # Backend có thể đã hỏng (đổi màn hình, mất display): tạo lại lần sau
+                self._close_sct()
+                return None
+
+    def _grab_dxcam(self, region: Optional[Tuple[int, int, int, int]]) -> Optional[np.ndarray]:
+        """
+        Lấy frame mới nhất từ DXcam (gọi khi đang giữ _sct_lock).
+
+        DXcam chụp liên tục màn hình chính ở thread riêng; vùng chụp được cắt
+        từ frame đó. Nếu DXcam lỗi, chuyển hẳn sang mss.
+
+        Args:
+            region: Vùng chụp (x, y, width, height). None = toàn màn hình
 
-                return img
+        Returns:
+            Numpy array (H, W, 4) hoặc None nếu cần dùng mss
+        """
+        try:
+            if self._cam is None:
+                dxcam = _lazy_import('dxcam')
+                if dxcam is None:
+                    raise ImportError('dxcam')
+                self._cam = dxcam.create(output_color="BGRA")
+                self._cam.start(target_fps=60, video_mode=True)
+            frame = self._cam.get_latest_frame()
         except Exception as e:
-            print(f"Lỗi chụp màn hình: {e}")
+            print(f"DXcam không khả dụng, dùng mss: {e}")
+            self._capture_backend = 'mss'
+            self._close_cam()
             return None
 
+        if frame is None or not region:
+            return frame
+
+        # Vùng nằm ngoài màn hình chính thì để mss chụp
+        x, y, width, height = region
+        if x < 0 or y < 0 or x + width > frame.shape[1] or y + height > frame.shape[0]:
+            return None
+        return frame[y:y + height, x:x + width]
+
+    def _close_sct(self) -> None:
+        """Đóng instance mss hiện tại (gọi khi đang giữ _sct_lock)."""
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception:
+                pass
+            self._sct = None
+
+    def _close_cam(self) -> None:
+        """Dừng DXcam (gọi khi đang giữ _sct_lock)."""
+        if self._cam is not None:
+            try:
+                self._cam.stop()
+                self._cam.release()
+            except Exception:
+                pass
+            self._cam = None
+
+    def close(self) -> None:
+        """Giải phóng backend chụp màn hình và Tesseract API."""
+        with self._sct_lock:
+            self._close_sct()
+            self._close_cam()
+
+        with self._tess_lock:
+            for api in self._tess_apis.values():
+                api.End()
+            self._tess_apis.clear()
+
+    def __enter__(self) -> 'VisionService':
+        """Dùng VisionService trong with để tự giải phóng backend chụp."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Gọi close() khi ra khỏi with."""
+        self.close()
+
     def save_screenshot(self, filename: str, region: Optional[Tuple[int, int, int, int]] = None) -> bool:
         """
         Chụp và lưu screenshot.
@@ -171,37 +479,90 @@ class VisionService:
 
     def load_template(self, template_path: str) -> Optional[np.ndarray]:
         """
-        Load template image từ file.
+        Load template image từ file (cache theo mtime/size của file).
+
+        Args:
+            template_path: Đường dẫn đến file template
+
+        Returns:
+            Numpy array (chỉ đọc) của template hoặc None nếu thất bại
+        """
+        entry = self._cached_template(template_path)
+        return entry[1] if entry is not None else None
+
+    def _load_template_gray(self, template_path: str) -> Optional[np.ndarray]:
+        """
+        Load template dạng grayscale, chỉ chuyển màu một lần cho mỗi phiên bản file.
+
+        Args:
+            template_path: Đường dẫn đến file template
+
+        Returns:
+            Ảnh grayscale (chỉ đọc) hoặc None nếu thất bại
+        """
+        entry = self._cached_template(template_path)
+        if entry is None:
+            return None
+
+        if entry[2] is None:
+            gray = cv2.cvtColor(entry[1], cv2.COLOR_BGR2GRAY)
+            gray.flags.writeable = False
+            entry[2] = gray
+        return entry[2]
+
+    def _cached_template(self, template_path: str) -> Optional[list]:
+        """
+        Lấy template từ cache, decode lại khi file thay đổi (mtime/size).
 
         Args:
             template_path: Đường dẫn đến file template
 
         Returns:
-            Numpy array của template hoặc None nếu thất bại
+            Entry [key, ảnh BGR, ảnh grayscale] hoặc None nếu thất bại
         """
         if not CV2_AVAILABLE:
             return None
 
-        if not os.path.exists(template_path):
+        try:
+            st = os.stat(template_path)
+        except OSError:
             print(f"Template không tồn tại: {template_path}")
             return None
 
+        key = (st.st_mtime_ns, st.st_size)
+        with self._templates_lock:
+            entry = self._templates.get(template_path)
+            if entry is not None and entry[0] == key:
+                self._templates.move_to_end(template_path)
+                return entry
+
         try:
             template = cv2.imread(template_path)
             if template is None:
                 print(f"Không thể load template: {template_path}")
                 return None
-            return template
         except Exception as e:
             print(f"Lỗi load template: {e}")
             return None
 
+        # Ảnh dùng chung giữa các lần gọi nên không cho sửa
+        template.flags.writeable = False
+        entry = [key, template, None]
+
+        with self._templates_lock:
+            self._templates[template_path] = entry
+            self._templates.move_to_end(template_path)
+            if len(self._templates) > self.TEMPLATE_CACHE_SIZE:
+                self._templates.popitem(last=False)
+        return entry
+
     def find_image_on_screen(
         self,
         template_path: str,
         confidence: Optional[float] = None,
         region: Optional[Tuple[int, int, int, int]] = None,
-        grayscale: bool = True
+        grayscale: bool = True,
+        multi_scale: bool = True
     ) -> MatchResult:
         """
         Tìm hình ảnh trên màn hình bằng template matching.
@@ -211,6 +572,9 @@ class VisionService:
             confidence: Ngưỡng độ tin cậy (None = dùng mặc định)
             region: Vùng tìm kiếm (x, y, width, height)
             grayscale: Có chuyển sang grayscale không (nhanh hơn)
+            multi_scale: Tìm thô trên ảnh thu nhỏ rồi tinh chỉnh ở độ phân giải
+                gốc (chỉ áp dụng cho template đủ lớn); không đạt ngưỡng thì
+                match lại toàn ảnh ở độ phân giải gốc
 
         Returns:
             MatchResult với thông tin tìm kiếm
@@ -220,32 +584,60 @@ class VisionService:
 
         confidence = confidence or self.confidence_threshold
 
-        # Load template
-        template = self.load_template(template_path)
-        if template is None:
+        # Load template (đã cache, kèm bản grayscale)
+        if grayscale:
+            template_gray = self._load_template_gray(template_path)
+        else:
+            template_gray = self.load_template(template_path)
+        if template_gray is None:
             return MatchResult(found=False)
 
-        # Chụp màn hình
-        screenshot = self.capture_screenshot(region)
-        if screenshot is None:
+        # Chụp màn hình (grayscale thì chuyển thẳng từ BGRA)
+        if grayscale:
+            screenshot_gray = self._capture_gray(region)
+        else:
+            screenshot_gray = self.capture_screenshot(region)
+        if screenshot_gray is None:
             return MatchResult(found=False)
 
-        try:
-            # Chuyển sang grayscale nếu cần
-            if grayscale:
-                template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-                screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-            else:
-                template_gray = template
-                screenshot_gray = screenshot
+        return self._locate(screenshot_gray, template_gray, confidence, region, multi_scale)
+
+    def _locate(
+        self,
+        screenshot: np.ndarray,
+        template: np.ndarray,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        multi_scale: bool = True
+    ) -> MatchResult:
+        """
+        Tìm template trong ảnh màn hình đã chụp.
+
+        Args:
+            screenshot: Ảnh màn hình (cùng số kênh với template)
+            template: Ảnh template
+            confidence: Ngưỡng độ tin cậy
+            region: Vùng đã chụp (để cộng offset vào tọa độ)
+            multi_scale: Cho phép matching coarse-to-fine
 
-            # Template matching
-            result = cv2.matchTemplate(screenshot_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        Returns:
+            MatchResult với thông tin tìm kiếm
+        """
+        try:
+            h, w = template.shape[:2]
+
+            # Template matching: thử coarse-to-fine trước; pyramid có thể bỏ sót
+            # template nhiều chi tiết nhỏ (mất khi thu nhỏ) nên không đạt ngưỡng
+            # thì match lại ở độ phân giải gốc
+            max_val = -1.0
+            if multi_scale and min(h, w) >= self.PYRAMID_MIN_TEMPLATE_SIZE:
+                max_val, max_loc = self._match_pyramid(screenshot, template, confidence)
+            if max_val < confidence:
+                result = self._match_template(screenshot, template)
+                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
 
             # Kiểm tra confidence
             if max_val >= confidence:
-                h, w = template_gray.shape[:2]
                 # Tọa độ tâm
                 center_x = max_loc[0] + w // 2
                 center_y = max_loc[1] + h // 2
@@ -272,12 +664,146 @@ class VisionService:
                 self.save_screenshot(f"error_{int(time.time())}.png")
             return MatchResult(found=False)
 
-    def find_all_images_on_screen(
+    def find_any_of(
         self,
-        template_path: str,
+        template_paths: List[str],
         confidence: Optional[float] = None,
         region: Optional[Tuple[int, int, int, int]] = None
     ) -> List[MatchResult]:
+        """
+        Tìm nhiều template trên cùng một ảnh chụp màn hình, match song song.
+
+        Args:
+            template_paths: Danh sách đường dẫn template
+            confidence: Ngưỡng độ tin cậy
+            region: Vùng tìm kiếm (x, y, width, height)
+
+        Returns:
+            Danh sách MatchResult theo thứ tự template_paths
+        """
+        if not CV2_AVAILABLE or not template_paths:
+            return [MatchResult(found=False) for _ in template_paths]
+
+        confidence = confidence or self.confidence_threshold
+
+        # Chụp một lần cho tất cả template
+        screenshot_gray = self._capture_gray(region)
+        if screenshot_gray is None:
+            return [MatchResult(found=False) for _ in template_paths]
+
+        def match_on(template_path: str) -> MatchResult:
+            template_gray = self._load_template_gray(template_path)
+            if template_gray is None:
+                return MatchResult(found=False)
+            return self._locate(screenshot_gray, template_gray, confidence, region)
+
+        if len(template_paths) == 1:
+            return [match_on(template_paths[0])]
+        return list(_MATCH_EXECUTOR.map(match_on, template_paths))
+
+    def _match_template(
+        self,
+        screenshot: np.ndarray,
+        template: np.ndarray,
+        cache_template: bool = True
+    ) -> np.ndarray:
+        """
+        cv2.matchTemplate (TM_CCOEFF_NORMED), chạy trên GPU qua OpenCL khi use_gpu.
+
+        Args:
+            screenshot: Ảnh màn hình
+            template: Ảnh template
+            cache_template: Giữ bản UMat của template để dùng lại (template từ cache)
+
+        Returns:
+            Ma trận kết quả matching (numpy array)
+        """
+        if not self.use_gpu:
+            return cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+
+        if cache_template:
+            with self._templates_lock:
+                cached = self._umats.get(id(template))
+                if cached is None or cached[0] is not template:
+                    cached = self._umats[id(template)] = (template, cv2.UMat(template))
+                    if len(self._umats) > self.TEMPLATE_CACHE_SIZE:
+                        self._umats.popitem(last=False)
+                else:
+                    self._umats.move_to_end(id(template))
+            u_template = cached[1]
+        else:
+            u_template = cv2.UMat(template)
+
+        return cv2.matchTemplate(
+            cv2.UMat(screenshot), u_template, cv2.TM_CCOEFF_NORMED
+        ).get()
+
+    def _match_pyramid(
+        self,
+        screenshot: np.ndarray,
+        template: np.ndarray,
+        confidence: float
+    ) -> Tuple[float, Tuple[int, int]]:
+        """
+        Template matching coarse-to-fine trên Gaussian pyramid.
+
+        Tìm ứng viên trên ảnh thu nhỏ (ngưỡng hạ PYRAMID_COARSE_MARGIN), sau đó
+        chỉ match lại ở độ phân giải gốc trong vùng nhỏ quanh mỗi ứng viên.
+
+        Args:
+            screenshot: Ảnh màn hình
+            template: Ảnh template (cùng số kênh với screenshot)
+            confidence: Ngưỡng độ tin cậy
+
+        Returns:
+            Tuple (độ tin cậy cao nhất, vị trí góc trên trái ở độ phân giải gốc)
+        """
+        small_screen, small_template = screenshot, template
+        for _ in range(self.PYRAMID_LEVELS):
+            small_screen = cv2.pyrDown(small_screen)
+            small_template = cv2.pyrDown(small_template)
+        scale = 1 << self.PYRAMID_LEVELS
+
+        coarse = self._match_template(small_screen, small_template, cache_template=False)
+
+        # Top-K vị trí ở mức thô vượt ngưỡng đã hạ
+        flat = coarse.ravel()
+        k = min(self.PYRAMID_CANDIDATES, flat.size)
+        top = np.argpartition(flat, -k)[-k:]
+        top = top[flat[top] >= confidence - self.PYRAMID_COARSE_MARGIN]
+        if top.size == 0:
+            return float(flat.max()), (0, 0)
+
+        h, w = template.shape[:2]
+        screen_h, screen_w = screenshot.shape[:2]
+        pad = self.PYRAMID_REFINE_PAD
+        best_val, best_loc = -1.0, (0, 0)
+
+        for y, x in zip(*np.unravel_index(top, coarse.shape)):
+            # Vùng tinh chỉnh quanh ứng viên ở độ phân giải gốc
+            left = max(int(x) * scale - pad, 0)
+            top_y = max(int(y) * scale - pad, 0)
+            right = min(int(x) * scale + w + pad, screen_w)
+            bottom = min(int(y) * scale + h + pad, screen_h)
+
+            roi = screenshot[top_y:bottom, left:right]
+            if roi.shape[0] < h or roi.shape[1] < w:
+                continue
+
+            result = cv2.matchTemplate(roi, template, cv2.TM_CCOEFF_NORMED)
+            _, val, _, loc = cv2.minMaxLoc(result)
+            if val > best_val:
+                best_val, best_loc = val, (left + loc[0], top_y + loc[1])
+
+        return best_val, best_loc
+
+    def find_all_images_on_screen(
+        self,
+        template_path: str,
+        confidence: Optional[float] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        non_max_suppression: bool = True
+    ) -> 'np.recarray':
         """
         Tìm tất cả vị trí của hình ảnh trên màn hình.
 
@@ -285,55 +811,55 @@ class VisionService:
             template_path: Đường dẫn đến template image
             confidence: Ngưỡng độ tin cậy
             region: Vùng tìm kiếm
+            non_max_suppression: Chỉ giữ vị trí có confidence cao nhất trong
+                vùng kích thước template (bỏ các match chồng lên nhau)
 
         Returns:
-            Danh sách MatchResult
+            Mảng record (found, x, y, confidence, width, height); mỗi phần tử
+            truy cập field như MatchResult (r.x, r.confidence). Dùng
+            MatchResult.from_record nếu cần dataclass. Luôn là mảng (rỗng nếu
+            không tìm thấy hoặc thiếu OpenCV): kiểm tra bằng len()/.size, không
+            dùng `if results:` (bool() của mảng >= 2 phần tử sẽ raise ValueError)
         """
+        no_matches = np.recarray((0,), dtype=_MATCH_DTYPE)
         if not CV2_AVAILABLE:
-            return []
+            return no_matches
 
         confidence = confidence or self.confidence_threshold
-        template = self.load_template(template_path)
-        if template is None:
-            return []
+        template_gray = self._load_template_gray(template_path)
+        if template_gray is None:
+            return no_matches
 
-        screenshot = self.capture_screenshot(region)
-        if screenshot is None:
-            return []
+        screenshot_gray = self._capture_gray(region)
+        if screenshot_gray is None:
+            return no_matches
 
         try:
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-            screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-
-            result = cv2.matchTemplate(screenshot_gray, template_gray, cv2.TM_CCOEFF_NORMED)
+            result = self._match_template(screenshot_gray, template_gray)
             h, w = template_gray.shape[:2]
 
             # Tìm tất cả vị trí có confidence >= threshold
-            locations = np.where(result >= confidence)
-            matches = []
-
-            for pt in zip(*locations[::-1]):
-                center_x = pt[0] + w // 2
-                center_y = pt[1] + h // 2
-
-                if region:
-                    center_x += region[0]
-                    center_y += region[1]
-
-                matches.append(MatchResult(
-                    found=True,
-                    x=center_x,
-                    y=center_y,
-                    confidence=result[pt[1], pt[0]],
-                    width=w,
-                    height=h
-                ))
-
+            mask = result >= confidence
+            if non_max_suppression:
+                # Cực đại cục bộ: bằng giá trị lớn nhất trong cửa sổ w x h quanh nó
+                kernel = np.ones((h, w), dtype=np.uint8)
+                mask &= result == cv2.dilate(result, kernel)
+            ys, xs = np.nonzero(mask)
+
+            # Điền từng cột, không tạo object Python cho mỗi kết quả;
+            # tọa độ tâm (cộng offset region nếu có)
+            matches = np.recarray((len(xs),), dtype=_MATCH_DTYPE)
+            matches.found = True
+            matches.x = xs + (w // 2 + (region[0] if region else 0))
+            matches.y = ys + (h // 2 + (region[1] if region else 0))
+            matches.confidence = result[ys, xs]
+            matches.width = w
+            matches.height = h
             return matches
 
         except Exception as e:
             print(f"Lỗi tìm kiếm tất cả hình ảnh: {e}")
-            return []
+            return no_matches
 
     def wait_for_image(
         self,
@@ -354,14 +880,36 @@ class VisionService:
         Returns:
             MatchResult nếu tìm thấy trong timeout
         """
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            result = self.find_image_on_screen(template_path, confidence)
-            if result.found:
-                return result
-
-            time.sleep(check_interval)
+        now = time.monotonic
+        deadline = now() + timeout
+        confidence = confidence or self.confidence_threshold
+        threshold = confidence - self.NEAR_MATCH_MARGIN
+        min_interval = min(check_interval, self.POLL_MIN_INTERVAL)
+        interval = min_interval
+        result = MatchResult(found=False)
+        digest = None
+
+        while True:
+            started = now()
+            if started >= deadline:
+                break
+
+            # Chỉ match lại khi màn hình thay đổi so với lần chụp trước
+            template_gray = self._load_template_gray(template_path)
+            if template_gray is not None:
+                screenshot_gray, digest = self._capture_if_changed(None, digest)
+                if screenshot_gray is not None:
+                    result = self._locate(screenshot_gray, template_gray, confidence)
+                    if result.found:
+                        return result
+
+            # Trừ thời gian match để nhịp poll không vượt interval
+            time.sleep(max(0.0, min(interval - (now() - started), deadline - now())))
+
+            if result.confidence >= threshold:
+                interval = min_interval
+            else:
+                interval = min(interval * self.POLL_BACKOFF, check_interval)
 
         # Timeout - chụp screenshot để debug
         if self.screenshot_on_error:
@@ -388,7 +936,8 @@ class VisionService:
         Returns:
             True nếu click thành công
         """
-        if not PYAUTOGUI_AVAILABLE:
+        pyautogui = _lazy_import('pyautogui') if PYAUTOGUI_AVAILABLE else None
+        if pyautogui is None:
             print("pyautogui không khả dụng")
             return False
 
@@ -420,7 +969,9 @@ class VisionService:
         y: int,
         width: int,
         height: int,
-        lang: str = 'eng'
+        lang: str = 'eng',
+        preprocess: bool = True,
+        single_line: bool = False
     ) -> Optional[str]:
         """
         Đọc text từ vùng màn hình bằng OCR (pytesseract).
@@ -431,32 +982,102 @@ class VisionService:
             width: Chiều rộng vùng
             height: Chiều cao vùng
             lang: Ngôn ngữ OCR (eng, vie, etc.)
+            preprocess: Nhị phân hóa (Otsu) và phóng to 2x trước khi OCR
+            single_line: Vùng chỉ chứa một dòng text (Tesseract --psm 7)
 
         Returns:
             Text đọc được hoặc None nếu thất bại
         """
-        if not PYTESSERACT_AVAILABLE:
+        if not PYTESSERACT_AVAILABLE and not TESSEROCR_AVAILABLE:
             print("pytesseract không khả dụng")
             return None
 
-        # Chụp vùng màn hình
-        screenshot = self.capture_screenshot((x, y, width, height))
+        # Chụp vùng màn hình (grayscale, OCR không cần màu)
+        screenshot = self._capture_gray((x, y, width, height))
         if screenshot is None:
             return None
 
-        try:
-            # Chuyển sang PIL Image để OCR
-            img_rgb = cv2.cvtColor(screenshot, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(img_rgb)
+        return self._recognize(screenshot, lang, preprocess, single_line)
 
-            # OCR
-            text = pytesseract.image_to_string(pil_img, lang=lang)
-            return text.strip()
+    def _recognize(
+        self,
+        gray: np.ndarray,
+        lang: str = 'eng',
+        preprocess: bool = True,
+        single_line: bool = False
+    ) -> Optional[str]:
+        """
+        Đọc text từ ảnh grayscale đã chụp.
+
+        Args:
+            gray: Ảnh grayscale của vùng text
+            lang: Ngôn ngữ OCR
+            preprocess: Nhị phân hóa và phóng to trước khi OCR
+            single_line: Vùng chỉ chứa một dòng text
+
+        Returns:
+            Text đọc được hoặc None nếu thất bại
+        """
+        try:
+            image = self._preprocess_ocr(gray) if preprocess else gray
+            return self._ocr(image, lang, single_line).strip()
 
         except Exception as e:
             print(f"Lỗi OCR: {e}")
             return None
 
+    def _ocr(self, image: np.ndarray, lang: str, single_line: bool) -> str:
+        """
+        Chạy OCR trên ảnh grayscale.
+
+        Dùng tesserocr (API giữ trong process, không phải chạy lại binary
+        tesseract mỗi lần) nếu có, ngược lại dùng pytesseract với ndarray.
+
+        Args:
+            image: Ảnh grayscale
+            lang: Ngôn ngữ OCR
+            single_line: Vùng chỉ chứa một dòng text
+
+        Returns:
+            Text đọc được
+        """
+        tesserocr = _lazy_import('tesserocr') if TESSEROCR_AVAILABLE else None
+        if tesserocr is not None:
+            with self._tess_lock:
+                api = self._tess_apis.get(lang)
+                if api is None:
+                    api = self._tess_apis[lang] = tesserocr.PyTessBaseAPI(
+                        lang=lang, oem=tesserocr.OEM.LSTM_ONLY
+                    )
+                api.SetPageSegMode(
+                    tesserocr.PSM.SINGLE_LINE if single_line else tesserocr.PSM.SINGLE_BLOCK
+                )
+                h, w = image.shape[:2]
+                api.SetImageBytes(np.ascontiguousarray(image).tobytes(), w, h, 1, w)
+                return api.GetUTF8Text()
+
+        config = '--oem 1 --psm 7' if single_line else '--oem 1 --psm 6'
+        return _lazy_import('pytesseract').image_to_string(image, lang=lang, config=config)
+
+    @staticmethod
+    def _preprocess_ocr(gray: np.ndarray) -> np.ndarray:
+        """
+        Chuẩn bị ảnh cho Tesseract: nhị phân hóa Otsu, chữ tối trên nền sáng, phóng to 2x.
+
+        Args:
+            gray: Ảnh grayscale của vùng text
+
+        Returns:
+            Ảnh nhị phân (0/255) đã phóng to
+        """
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        # Giao diện tối (chữ sáng trên nền tối): đảo màu, Tesseract đọc tốt hơn nền sáng
+        if cv2.countNonZero(binary) * 2 < binary.size:
+            binary = cv2.bitwise_not(binary)
+
+        return cv2.resize(binary, None, fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
+
     def wait_for_text(
         self,
         x: int,
@@ -484,13 +1105,23 @@ class VisionService:
         Returns:
             True nếu tìm thấy text trong timeout
         """
-        if not PYTESSERACT_AVAILABLE:
+        if not PYTESSERACT_AVAILABLE and not TESSEROCR_AVAILABLE:
             return False
 
-        start_time = time.time()
+        now = time.monotonic
+        deadline = now() + timeout
+        interval = min(check_interval, self.POLL_MIN_INTERVAL)
+        region = (x, y, width, height)
+        digest = None
+
+        while True:
+            started = now()
+            if started >= deadline:
+                break
 
-        while time.time() - start_time < timeout:
-            text = self.read_text_region(x, y, width, height)
+            # Chỉ OCR khi pixel trong vùng thay đổi (hash toàn bộ vùng, vùng text nhỏ)
+            screenshot, digest = self._capture_if_changed(region, digest, step=1)
+            text = self._recognize(screenshot) if screenshot is not None else None
 
             if text:
                 if partial_match:
@@ -500,7 +1131,9 @@ class VisionService:
                     if expected_text.lower() == text.lower():
                         return True
 
-            time.sleep(check_interval)
+            # Trừ thời gian OCR để nhịp poll không vượt interval
+            time.sleep(max(0.0, min(interval - (now() - started), deadline - now())))
+            interval = min(interval * self.POLL_BACKOFF, check_interval)
 
         return False
 
@@ -515,6 +1148,8 @@ class VisionService:
         return {
             'opencv': CV2_AVAILABLE,
             'mss': MSS_AVAILABLE,
+            'dxcam': DXCAM_AVAILABLE,
             'pytesseract': PYTESSERACT_AVAILABLE,
+            'tesserocr': TESSEROCR_AVAILABLE,
             'pyautogui': PYAUTOGUI_AVAILABLE
         }
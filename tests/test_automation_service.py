@@ -0,0 +1,157 @@
+"""
+Test Automation Service - Unit tests cho AutomationService.
+
+Tests:
+- Đóng CapCut (process tự khởi chạy và các instance khác)
+- Xếp hàng các lần xuất async
+- Nhớ UIA lỗi để dùng thẳng hotkey
+- Đóng vision service
+- Chờ cửa sổ và kết nối UIA
+"""
+
+import unittest
+import os
+import sys
+import time
+import asyncio
+from unittest import mock
+
+# Thêm thư mục gốc vào path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import automation_service
+from services.automation_service import AutomationService
+
+
+class TestAutomationService(unittest.TestCase):
+    """Test cases cho AutomationService."""
+
+    def setUp(self):
+        """Setup trước mỗi test."""
+        self.logs = []
+        self.service = AutomationService(
+            'CapCut.exe', log_callback=self.logs.append, use_vision=False
+        )
+
+    def test_close_capcut_also_closes_other_instances(self):
+        """Test đóng process tự khởi chạy xong vẫn đóng các instance CapCut khác."""
+        owned = mock.Mock(pid=100)
+        owned.poll.return_value = None
+        other = mock.Mock(pid=200)
+        self.service._capcut_process = owned
+        self.service._capcut_pid = 100
+
+        with mock.patch.object(automation_service, 'PSUTIL_AVAILABLE', True), \
+                mock.patch.object(automation_service, '_iter_capcut_procs',
+                                  return_value=iter([other])):
+            self.assertTrue(self.service.close_capcut())
+
+        owned.terminate.assert_called_once()
+        other.terminate.assert_called_once()
+        self.assertIsNone(self.service._capcut_process)
+        self.assertIsNone(self.service._capcut_pid)
+
+    def test_close_capcut_nothing_running(self):
+        """Test không có CapCut nào đang chạy."""
+        with mock.patch.object(automation_service, 'PSUTIL_AVAILABLE', True), \
+                mock.patch.object(automation_service, '_iter_capcut_procs',
+                                  return_value=iter([])):
+            self.assertFalse(self.service.close_capcut())
+
+    def test_export_project_async_serialized(self):
+        """Test các lần xuất async đồng thời chạy lần lượt, không chồng lên nhau."""
+        running = []
+        overlaps = []
+
+        async def fake_run_steps(steps):
+            steps.close()
+            overlaps.append(bool(running))
+            running.append(1)
+            await asyncio.sleep(0.01)
+            running.pop()
+            return True
+
+        async def export_all():
+            return await asyncio.gather(
+                self.service.export_project_async('p1'),
+                self.service.export_project_async('p2'),
+                self.service.export_project_async('p3')
+            )
+
+        with mock.patch.object(self.service, '_run_steps_async', side_effect=fake_run_steps):
+            results = asyncio.run(export_all())
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(overlaps, [False, False, False])
+
+    def test_run_steps_async_cancel_interrupts_wait(self):
+        """Test cancel() dừng khoảng chờ của driver async ngay, không chờ hết."""
+        def steps():
+            yield 5
+            return True
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, self.service.cancel)
+            return await self.service._run_steps_async(steps())
+
+        start = time.monotonic()
+        self.assertFalse(asyncio.run(run()))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_click_export_uia_failure_remembered(self):
+        """Test UIA không tìm được nút Export thì các lần sau không thử UIA nữa."""
+        window = mock.Mock()
+        window.child_window.return_value.wait.side_effect = RuntimeError('timeout')
+
+        with mock.patch.object(automation_service, 'PYWINAUTO_AVAILABLE', True), \
+                mock.patch.object(self.service, '_get_top_window',
+                                  return_value=window) as get_window:
+            self.assertFalse(self.service._click_export_uia())
+            self.assertFalse(self.service._click_export_uia())
+
+            self.assertEqual(get_window.call_count, 1)
+            window.child_window.return_value.wait.assert_called_once_with(
+                'exists', timeout=AutomationService.UIA_TIMEOUT
+            )
+
+            self.service.reset()
+            self.service._click_export_uia()
+            self.assertEqual(get_window.call_count, 2)
+
+    def test_close_releases_vision_service(self):
+        """Test close() giải phóng backend chụp của vision service."""
+        self.service.close()
+
+        self.service.vision_service = mock.Mock()
+        self.service.close()
+        self.service.vision_service.close.assert_called_once()
+
+    def test_wait_for_window_found(self):
+        """Test tìm thấy handle cửa sổ thì trả về ngay, không tạo Application."""
+        with mock.patch.object(automation_service, 'PYWINAUTO_AVAILABLE', True), \
+                mock.patch.object(automation_service, 'find_windows', create=True,
+                                  return_value=[1234]), \
+                mock.patch.object(automation_service, 'Application', create=True) as app:
+            self.assertTrue(self.service._wait_for_window(timeout=1))
+
+        app.assert_not_called()
+
+    def test_get_uia_app_timeout_returns_none(self):
+        """Test connect hết timeout thì trả về None thay vì raise."""
+        class FakeTimeoutError(Exception):
+            pass
+
+        app = mock.Mock()
+        app.return_value.connect.side_effect = FakeTimeoutError()
+
+        with mock.patch.object(automation_service, 'Application', app, create=True), \
+                mock.patch.object(automation_service, 'ElementNotFoundError',
+                                  LookupError, create=True), \
+                mock.patch.object(automation_service, 'PywinautoTimeoutError',
+                                  FakeTimeoutError, create=True):
+            self.assertIsNone(self.service._get_uia_app())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Test CapCut Service - Unit tests cho CapCutService.
+
+Tests:
+- Tìm đường dẫn CapCut.exe và thư mục data
+- Cache kết quả tìm kiếm
+- Cache danh sách project theo stat thư mục và file metadata
+- Kiểm tra project hợp lệ
+"""
+
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# Thêm thư mục gốc vào path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.config import Config
+from services.capcut_service import CapCutService
+
+
+class TestCapCutService(unittest.TestCase):
+    """Test cases cho CapCutService."""
+
+    def setUp(self):
+        """Setup trước mỗi test."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = CapCutService(Config())
+
+    def tearDown(self):
+        """Dọn dẹp sau mỗi test."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _touch(self, *parts):
+        """Tạo file rỗng trong thư mục tạm."""
+        path = os.path.join(self.temp_dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+        return path
+
+    def test_find_capcut_exe_default_paths_order(self):
+        """Test tìm exe theo thứ tự ưu tiên của đường dẫn mặc định."""
+        second = self._touch('b', 'CapCut.exe')
+        third = self._touch('a', 'CapCut.exe')
+        self.service.DEFAULT_EXE_PATHS = [
+            os.path.join(self.temp_dir, 'a', 'Missing.exe'),
+            second,
+            third,
+        ]
+
+        self.assertEqual(self.service.find_capcut_exe(), second)
+
+    def test_find_capcut_exe_ignores_folders(self):
+        """Test thư mục trùng tên không được coi là exe."""
+        os.makedirs(os.path.join(self.temp_dir, 'CapCut.exe'))
+        self.service.DEFAULT_EXE_PATHS = [os.path.join(self.temp_dir, 'CapCut.exe')]
+
+        self.assertIsNone(self.service.find_capcut_exe())
+
+    def test_find_data_folder_cached(self):
+        """Test kết quả tìm thư mục data được cache đến khi đổi config."""
+        data_folder = os.path.join(self.temp_dir, 'data')
+        os.makedirs(data_folder)
+        self.service.DEFAULT_DATA_PATHS = [data_folder]
+
+        self.assertEqual(self.service.find_data_folder(), data_folder)
+
+        os.rmdir(data_folder)
+        self.assertEqual(self.service.find_data_folder(), data_folder)
+
+        self.service.update_config(Config())
+        self.assertIsNone(self.service.find_data_folder())
+
+    def test_find_cache_expires(self):
+        """Test cache tìm kiếm hết hạn sau FIND_CACHE_TTL."""
+        self.service.DEFAULT_EXE_PATHS = [os.path.join(self.temp_dir, 'CapCut.exe')]
+        self.assertIsNone(self.service.find_capcut_exe())
+
+        exe_path = self._touch('CapCut.exe')
+        self.assertIsNone(self.service.find_capcut_exe())
+
+        self.service.FIND_CACHE_TTL = 0
+        self.service.update_config(Config())
+        self.assertEqual(self.service.find_capcut_exe(), exe_path)
+        os.remove(exe_path)
+        self.assertIsNone(self.service.find_capcut_exe())
+
+    def _make_data_folder(self, *project_ids):
+        """Tạo thư mục data với các project rỗng."""
+        data_folder = os.path.join(self.temp_dir, 'data')
+        os.makedirs(data_folder, exist_ok=True)
+        for project_id in project_ids:
+            os.makedirs(os.path.join(data_folder, project_id))
+        self.service.DEFAULT_DATA_PATHS = [data_folder]
+        return data_folder
+
+    def test_get_projects_cached_until_projects_change(self):
+        """Test danh sách project được cache đến khi project hoặc metadata thay đổi."""
+        data_folder = self._make_data_folder('p1', 'p2')
+
+        projects = self.service.get_projects()
+        self.assertEqual(sorted(p.id for p in projects), ['p1', 'p2'])
+        self.assertIs(self.service._load_projects(False), self.service._load_projects(False))
+
+        # Kết quả trả về là bản sao, sửa list không ảnh hưởng cache
+        projects.clear()
+        self.assertEqual(len(self.service.get_projects()), 2)
+
+        # Sửa metadata bên trong project được thấy ngay, không cần invalidate
+        with open(os.path.join(data_folder, 'p1', 'draft_info.json'), 'w') as f:
+            json.dump({'draft_name': 'Renamed'}, f)
+        self.assertIn('Renamed', [p.name for p in self.service.get_projects()])
+
+        os.makedirs(os.path.join(data_folder, 'p3'))
+        self.assertEqual(self.service.get_project_count(), 3)
+        self.assertEqual(len(self.service.get_projects()), 3)
+
+    def test_get_projects_reuses_unchanged_projects(self):
+        """Test project có thư mục chưa đổi mtime được lấy từ cache."""
+        data_folder = self._make_data_folder('p1', 'p2')
+        first = {p.id: p for p in self.service.get_projects()}
+
+        os.makedirs(os.path.join(data_folder, 'p3'))
+        with open(os.path.join(data_folder, 'p2', 'draft_info.json'), 'w') as f:
+            json.dump({'draft_name': 'Renamed'}, f)
+        os.utime(data_folder, ns=(0, os.stat(data_folder).st_mtime_ns + 1))
+        second = {p.id: p for p in self.service.get_projects()}
+
+        self.assertIs(second['p1'], first['p1'])
+        self.assertEqual(second['p2'].name, 'Renamed')
+        self.assertIn('p3', second)
+
+        self.service.invalidate_project_cache()
+        third = {p.id: p for p in self.service.get_projects()}
+        self.assertIsNot(third['p1'], second['p1'])
+
+    def test_get_projects_detects_metadata_edit_in_place(self):
+        """Test sửa draft_info.json tại chỗ (không đổi mtime thư mục) vẫn được đọc lại."""
+        data_folder = self._make_data_folder('p1')
+        info_path = os.path.join(data_folder, 'p1', 'draft_info.json')
+        with open(info_path, 'w') as f:
+            json.dump({'draft_name': 'A'}, f)
+        folder_mtime = os.stat(os.path.join(data_folder, 'p1')).st_mtime_ns
+        data_mtime = os.stat(data_folder).st_mtime_ns
+
+        self.assertEqual(
+            [(p.name, p.is_trash) for p in self.service.get_projects()], [('A', False)]
+        )
+
+        with open(info_path, 'w') as f:
+            json.dump({'draft_name': 'Renamed', 'draft_is_deleted': True}, f)
+        os.utime(os.path.join(data_folder, 'p1'), ns=(0, folder_mtime))
+        os.utime(data_folder, ns=(0, data_mtime))
+
+        self.assertEqual(self.service.get_projects(), [])
+        self.assertEqual(self.service.get_project_count(), 0)
+        projects = self.service.get_projects(include_trash=True)
+        self.assertEqual([(p.name, p.is_trash) for p in projects], [('Renamed', True)])
+
+    def test_get_projects_trash_filter(self):
+        """Test lọc project trong thùng rác."""
+        data_folder = self._make_data_folder('p1', 'p2')
+        with open(os.path.join(data_folder, 'p2', 'draft_info.json'), 'w') as f:
+            json.dump({'draft_is_deleted': True}, f)
+
+        self.assertEqual([p.id for p in self.service.get_projects()], ['p1'])
+        self.assertEqual(self.service.get_project_count(include_trash=True), 2)
+
+    def test_validate_project(self):
+        """Test kiểm tra draft_content.json có dữ liệu timeline."""
+        data_folder = self._make_data_folder('valid', 'empty', 'missing')
+        with open(os.path.join(data_folder, 'valid', 'draft_content.json'), 'w') as f:
+            json.dump({'tracks': []}, f)
+        open(os.path.join(data_folder, 'empty', 'draft_content.json'), 'w').close()
+
+        projects = {p.id: p for p in self.service.get_projects()}
+
+        self.assertTrue(self.service.validate_project(projects['valid']))
+        self.assertFalse(self.service.validate_project(projects['empty']))
+        self.assertFalse(self.service.validate_project(projects['missing']))
+
+    def test_get_project_by_id(self):
+        """Test lấy project theo ID."""
+        self._make_data_folder('p1')
+
+        self.assertEqual(self.service.get_project_by_id('p1').id, 'p1')
+        self.assertIsNone(self.service.get_project_by_id('missing'))
+
+    def test_get_project_count_without_listing(self):
+        """Test đếm project không cần đọc danh sách trước."""
+        data_folder = self._make_data_folder('p1', 'p2', 'p3')
+        with open(os.path.join(data_folder, 'p3', 'draft_info.json'), 'w') as f:
+            json.dump({'is_trash': True}, f)
+
+        self.assertEqual(self.service.get_project_count(), 2)
+        self.assertEqual(self.service.get_project_count(include_trash=True), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
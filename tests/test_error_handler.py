@@ -0,0 +1,213 @@
+"""
+Test Error Handler - Unit tests cho ErrorHandler.
+
+Tests:
+- Ghi log lỗi theo severity
+- Bỏ qua format message khi level bị tắt
+- Bộ đệm ghi log file
+- Ghi log qua QueueListener và đóng handler
+- Formatter cache phần thời gian
+- Retry với backoff (sync và async)
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import asyncio
+import logging
+import tempfile
+
+# Thêm thư mục gốc vào path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.error_handler import ErrorHandler, ErrorSeverity, CachedPrefixFormatter
+
+
+class _StrCounter:
+    """Object đếm số lần bị str() khi format log."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return 'counter'
+
+
+class TestErrorHandler(unittest.TestCase):
+    """Test cases cho ErrorHandler."""
+
+    def setUp(self):
+        """Setup trước mỗi test."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.handler = ErrorHandler(
+            screenshot_on_error=False,
+            log_dir=os.path.join(self.temp_dir, 'logs')
+        )
+
+    def tearDown(self):
+        """Dọn dẹp sau mỗi test."""
+        self.handler.close()
+        logging.getLogger('ErrorHandler').setLevel(logging.DEBUG)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_handle_error_logs_message(self):
+        """Test log lỗi kèm exception và context."""
+        with self.assertLogs('ErrorHandler', level='DEBUG') as logs:
+            info = self.handler.handle_error(
+                ValueError('boom'), 'Export lỗi', context={'project': 'p1'}
+            )
+
+        self.assertEqual(info.severity, ErrorSeverity.ERROR)
+        self.assertIn(
+            "ERROR:ErrorHandler:Export lỗi - Exception: boom - Context: {'project': 'p1'}",
+            logs.output
+        )
+        self.assertEqual(self.handler.get_statistics()['by_severity']['error'], 1)
+
+    def test_disabled_level_skips_formatting(self):
+        """Test level bị tắt thì không str() exception/context."""
+        logging.getLogger('ErrorHandler').setLevel(logging.CRITICAL)
+        counter = _StrCounter()
+
+        self.handler.handle_error(
+            ValueError('boom'), 'Cảnh báo', severity=ErrorSeverity.WARNING,
+            context={'value': counter}
+        )
+
+        self.assertEqual(counter.calls, 0)
+        self.assertEqual(self.handler.error_count, 1)
+
+    def test_log_file_buffered_until_error(self):
+        """Test record dưới ERROR được giữ trong bộ đệm đến khi có lỗi."""
+        log_file = os.path.join(self.temp_dir, 'logs', 'errors.log')
+
+        listener = self.handler._listener
+
+        # stop() chờ thread ghi log xử lý hết queue
+        self.handler.logger.info('Đang export')
+        listener.stop()
+        with open(log_file, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '')
+
+        listener.start()
+        self.handler.logger.error('Export lỗi')
+        listener.stop()
+        listener.start()
+        with open(log_file, encoding='utf-8') as f:
+            content = f.read()
+        self.assertIn('INFO - Đang export', content)
+        self.assertIn('ERROR - Export lỗi', content)
+
+    def test_close_flushes_and_detaches(self):
+        """Test close() ghi nốt log, gỡ handler khỏi logger và gọi lại được."""
+        log_file = os.path.join(self.temp_dir, 'logs', 'errors.log')
+        self.handler.logger.warning('Thử lại lần 1')
+
+        self.handler.close()
+        self.handler.close()
+
+        with open(log_file, encoding='utf-8') as f:
+            self.assertIn('WARNING - Thử lại lần 1', f.read())
+        self.assertNotIn(
+            self.handler._queue_handler, logging.getLogger('ErrorHandler').handlers
+        )
+
+    def test_second_instance_reuses_logging(self):
+        """Test instance thứ hai không thêm handler/thread ghi log mới."""
+        logger = logging.getLogger('ErrorHandler')
+        handlers = list(logger.handlers)
+
+        second = ErrorHandler(
+            screenshot_on_error=False,
+            log_dir=os.path.join(self.temp_dir, 'logs2')
+        )
+        self.assertEqual(logger.handlers, handlers)
+        self.assertIsNone(second._listener)
+
+        # close() của instance thứ hai không gỡ logging của instance đầu
+        second.close()
+        self.assertEqual(logger.handlers, handlers)
+
+    def test_retry_with_backoff(self):
+        """Test retry đến khi thành công và gọi on_retry mỗi lần lỗi."""
+        calls = []
+        retried = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError('chưa sẵn sàng')
+            return 'ok'
+
+        result = self.handler.retry_with_backoff(
+            flaky, initial_delay=0, on_retry=lambda attempt, e: retried.append(attempt)
+        )
+
+        self.assertEqual(result, 'ok')
+        self.assertEqual(retried, [1, 2])
+
+    def test_retry_with_backoff_exhausted(self):
+        """Test raise exception cuối khi hết số lần thử."""
+        def always_fail():
+            raise ValueError('lỗi')
+
+        with self.assertRaises(ValueError):
+            self.handler.retry_with_backoff(always_fail, max_attempts=2, initial_delay=0)
+        self.assertEqual(self.handler.error_count, 1)
+
+    def test_aretry_with_backoff(self):
+        """Test bản async chờ bằng asyncio.sleep và hỗ trợ coroutine function."""
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 2:
+                raise ValueError('chưa sẵn sàng')
+            return 'ok'
+
+        self.assertEqual(
+            asyncio.run(self.handler.aretry_with_backoff(flaky, initial_delay=0)), 'ok'
+        )
+        self.assertEqual(
+            asyncio.run(self.handler.aretry_with_backoff(lambda: 'sync', initial_delay=0)),
+            'sync'
+        )
+
+    def test_next_delay(self):
+        """Test thời gian chờ tăng theo cấp số nhân."""
+        delays = [ErrorHandler._next_delay(attempt, 1.0, 2.0) for attempt in (1, 2, 3)]
+
+        self.assertEqual(delays, [1.0, 2.0, 4.0])
+
+    def test_next_delay_cap_and_full_jitter(self):
+        """Test giới hạn max_delay và full jitter nằm trong [0, delay]."""
+        self.assertEqual(ErrorHandler._next_delay(10, 1.0, 2.0, max_delay=5.0), 5.0)
+
+        for attempt in range(1, 8):
+            delay = ErrorHandler._next_delay(attempt, 0.05, 2.0, 1.0, 'full')
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(1.0, 0.05 * 2 ** (attempt - 1)))
+
+
+class TestCachedPrefixFormatter(unittest.TestCase):
+    """Test cases cho CachedPrefixFormatter."""
+
+    def test_matches_default_formatter(self):
+        """Test output giống logging.Formatter, kể cả khi sang giây mới."""
+        fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        cached = CachedPrefixFormatter(fmt)
+        default = logging.Formatter(fmt)
+
+        for created in (1700000000.125, 1700000000.875, 1700000001.5):
+            record = logging.LogRecord(
+                'ErrorHandler', logging.ERROR, __file__, 1, 'Lỗi %s', ('x',), None
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            self.assertEqual(cached.format(record), default.format(record))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Test File Service - Unit tests cho FileService.
+
+Tests:
+- Liệt kê folder và file
+- Kiểm tra file/folder tồn tại
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+# Thêm thư mục gốc vào path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.file_service import FileService
+
+
+class TestFileService(unittest.TestCase):
+    """Test cases cho FileService."""
+
+    def setUp(self):
+        """Setup trước mỗi test."""
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, 'folder_a'))
+        os.makedirs(os.path.join(self.temp_dir, 'folder_b'))
+        for name in ('a.json', 'b.txt'):
+            open(os.path.join(self.temp_dir, name), 'w').close()
+
+    def tearDown(self):
+        """Dọn dẹp sau mỗi test."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_list_folders(self):
+        """Test chỉ liệt kê folder con."""
+        folders = FileService.list_folders(self.temp_dir)
+
+        self.assertEqual(
+            sorted(os.path.basename(p) for p in folders),
+            ['folder_a', 'folder_b']
+        )
+
+    def test_scan_folders(self):
+        """Test scan_folders trả về DirEntry của folder con."""
+        entries = FileService.scan_folders(self.temp_dir)
+
+        self.assertEqual(sorted(e.name for e in entries), ['folder_a', 'folder_b'])
+        self.assertTrue(all(e.is_dir() for e in entries))
+
+    def test_list_files_with_extension(self):
+        """Test liệt kê file có lọc theo đuôi."""
+        all_files = FileService.list_files(self.temp_dir)
+        json_files = FileService.list_files(self.temp_dir, '.json')
+
+        self.assertEqual(sorted(os.path.basename(p) for p in all_files), ['a.json', 'b.txt'])
+        self.assertEqual([os.path.basename(p) for p in json_files], ['a.json'])
+
+    def test_list_missing_folder(self):
+        """Test folder không tồn tại trả về danh sách rỗng."""
+        missing = os.path.join(self.temp_dir, 'missing')
+
+        self.assertEqual(FileService.list_folders(missing), [])
+        self.assertEqual(FileService.list_files(missing), [])
+
+    def test_exists(self):
+        """Test kiểm tra file/folder tồn tại."""
+        file_path = os.path.join(self.temp_dir, 'a.json')
+        folder_path = os.path.join(self.temp_dir, 'folder_a')
+
+        self.assertTrue(FileService.file_exists(file_path))
+        self.assertFalse(FileService.file_exists(folder_path))
+        self.assertTrue(FileService.folder_exists(folder_path))
+        self.assertFalse(FileService.folder_exists(file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
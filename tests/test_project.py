@@ -0,0 +1,128 @@
+"""
+Test Project - Unit tests cho Project model.
+
+Tests:
+- Đọc metadata từ draft_info.json
+- Fallback sang draft_content.json
+- Fallback sang thời gian file system
+- Kiểm tra nhanh trạng thái thùng rác
+"""
+
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# Thêm thư mục gốc vào path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.project import Project
+
+
+class TestProject(unittest.TestCase):
+    """Test cases cho Project."""
+
+    def setUp(self):
+        """Setup trước mỗi test."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Dọn dẹp sau mỗi test."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _make_project(self, project_id, filename=None, data=None):
+        """Tạo thư mục project với file metadata (tùy chọn)."""
+        folder = os.path.join(self.temp_dir, project_id)
+        os.makedirs(folder)
+        if filename:
+            with open(os.path.join(folder, filename), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        return folder
+
+    def test_from_folder_draft_info(self):
+        """Test đọc metadata từ draft_info.json."""
+        folder = self._make_project('p1', 'draft_info.json', {
+            'draft_name': 'Video 1',
+            'tm_draft_create': 1700000000000,
+            'tm_draft_modified': 1700000100000,
+            'draft_is_deleted': True
+        })
+
+        project = Project.from_folder(folder)
+
+        self.assertEqual(project.id, 'p1')
+        self.assertEqual(project.name, 'Video 1')
+        self.assertTrue(project.is_trash)
+        self.assertEqual(project.created_date.timestamp(), 1700000000)
+        self.assertEqual(project.modified_date.timestamp(), 1700000100)
+
+    def test_from_folder_trash_key_fallback(self):
+        """Test nhận diện trash qua key is_trash."""
+        folder = self._make_project('p5', 'draft_info.json', {'is_trash': True})
+
+        self.assertTrue(Project.from_folder(folder).is_trash)
+
+    def test_from_folder_draft_content(self):
+        """Test fallback sang draft_content.json."""
+        folder = self._make_project('p2', 'draft_content.json', {'name': 'Video 2'})
+
+        project = Project.from_folder(folder)
+
+        self.assertEqual(project.name, 'Video 2')
+        self.assertFalse(project.is_trash)
+        self.assertIsNotNone(project.created_date)
+        self.assertIsNotNone(project.modified_date)
+
+    def test_from_folder_without_metadata(self):
+        """Test project không có metadata dùng tên thư mục."""
+        folder = self._make_project('p3')
+
+        project = Project.from_folder(folder)
+
+        self.assertEqual(project.name, 'p3')
+        self.assertIsNotNone(project.modified_date)
+
+    def test_from_folder_invalid_json(self):
+        """Test file JSON lỗi vẫn tạo được project."""
+        folder = self._make_project('p4')
+        with open(os.path.join(folder, 'draft_info.json'), 'w') as f:
+            f.write('{invalid')
+
+        project = Project.from_folder(folder)
+
+        self.assertEqual(project.name, 'p4')
+        self.assertIsNotNone(project.created_date)
+
+    def test_from_folder_missing(self):
+        """Test thư mục không tồn tại."""
+        self.assertIsNone(Project.from_folder(os.path.join(self.temp_dir, 'missing')))
+
+    def test_from_folder_with_stat(self):
+        """Test dùng stat có sẵn thay vì stat lại thư mục."""
+        folder = self._make_project('p6')
+        folder_stat = os.stat(folder)
+
+        project = Project.from_folder(folder, folder_stat)
+
+        self.assertEqual(project.modified_ts_ms, folder_stat.st_mtime_ns // 1_000_000)
+        self.assertIsNone(Project.from_folder(folder, os.stat(__file__)))
+
+    def test_quick_is_trash(self):
+        """Test kiểm tra nhanh cờ trash không cần parse JSON."""
+        trashed = self._make_project('t1', 'draft_info.json', {'draft_is_deleted': True})
+        legacy = self._make_project('t2', 'draft_info.json', {'is_trash': 1})
+        active = self._make_project('t3', 'draft_info.json', {'draft_is_deleted': False})
+        missing = self._make_project('t4')
+        nested = self._make_project('t5', 'draft_info.json', {'extra': {'is_trash': True}})
+
+        self.assertTrue(Project.quick_is_trash(trashed))
+        self.assertTrue(Project.quick_is_trash(legacy))
+        self.assertFalse(Project.quick_is_trash(active))
+        self.assertFalse(Project.quick_is_trash(missing))
+        self.assertFalse(Project.quick_is_trash(nested))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,254 @@
+"""
+Test Template Manager - Unit tests cho TemplateManager.
+
+Tests:
+- Liệt kê templates
+- Thêm, lấy và xóa template
+- Đọc kích thước và validate template
+- Cache metadata giữa các instance
+"""
+
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+# Thêm thư mục gốc vào path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from services.template_manager import TemplateManager
+
+
+class TestTemplateManager(unittest.TestCase):
+    """Test cases cho TemplateManager."""
+
+    def setUp(self):
+        """Setup trước mỗi test."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = TemplateManager(os.path.join(self.temp_dir, 'templates'))
+
+        # Ảnh nguồn 40x20
+        self.source_path = os.path.join(self.temp_dir, 'source.png')
+        cv2.imwrite(self.source_path, np.full((20, 40, 3), 255, dtype=np.uint8))
+
+    def tearDown(self):
+        """Dọn dẹp sau mỗi test."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_and_get_template(self):
+        """Test thêm template và đọc lại kích thước."""
+        self.assertTrue(self.manager.add_template(self.source_path, 'export', description='Nút export'))
+
+        template = self.manager.get_template('export')
+
+        self.assertIsNotNone(template)
+        self.assertEqual((template.width, template.height), (40, 20))
+        self.assertEqual(template.description, 'Nút export')
+
+    def test_add_template_from_image(self):
+        """Test thêm template từ ảnh trong bộ nhớ."""
+        image = np.full((15, 25, 3), 200, dtype=np.uint8)
+
+        self.assertTrue(self.manager.add_template(None, 'captured', image=image))
+        self.assertFalse(self.manager.add_template(None, 'missing'))
+
+        template = self.manager.get_template('captured')
+        self.assertEqual((template.width, template.height), (25, 15))
+
+    def test_list_templates(self):
+        """Test liệt kê templates theo category và version."""
+        self.manager.add_template(self.source_path, 'export', 'buttons')
+        self.manager.add_template(self.source_path, 'export', 'buttons', 'v2')
+        self.manager.add_template(self.source_path, 'done', 'status')
+        os.makedirs(os.path.join(self.manager.template_dir, 'buttons', 'folder.png'))
+
+        all_templates = self.manager.list_templates()
+        buttons = self.manager.list_templates(category='buttons')
+        v2 = self.manager.list_templates(version='v2')
+
+        self.assertEqual(len(all_templates), 3)
+        self.assertEqual(len(buttons), 2)
+        self.assertEqual([(t.name, t.version) for t in v2], [('export', 'v2')])
+
+    def test_list_templates_name_with_underscore(self):
+        """Test phần sau dấu '_' cuối cùng được coi là version."""
+        self.manager.add_template(self.source_path, 'export_dialog', 'buttons', 'v3')
+
+        templates = self.manager.list_templates(category='buttons')
+
+        self.assertEqual([(t.name, t.version) for t in templates], [('export_dialog', 'v3')])
+
+    def test_batch_saves_metadata_once(self):
+        """Test batch() chỉ ghi metadata khi thoát context."""
+        metadata_path = self.manager.metadata_path
+
+        with self.manager.batch():
+            self.manager.add_template(self.source_path, 'export')
+            self.manager.add_template(self.source_path, 'done', 'status')
+            self.assertFalse(os.path.exists(metadata_path))
+
+        with open(metadata_path, 'rb') as f:
+            self.assertEqual(len(json.loads(f.read())), 2)
+        self.assertEqual(len(TemplateManager(self.manager.template_dir).metadata), 2)
+
+    def test_delete_template(self):
+        """Test xóa template."""
+        self.manager.add_template(self.source_path, 'export')
+        self.assertIsNotNone(self.manager.get_template('export'))
+
+        self.assertTrue(self.manager.delete_template('export'))
+
+        self.assertIsNone(self.manager.get_template('export'))
+        self.assertEqual(self.manager.list_templates(), [])
+
+    def test_read_png_size(self):
+        """Test đọc kích thước từ PNG header."""
+        from services.template_manager import _read_png_size
+
+        self.assertEqual(_read_png_size(self.source_path), (40, 20))
+
+        not_png = os.path.join(self.temp_dir, 'image.jpg')
+        cv2.imwrite(not_png, np.zeros((5, 5, 3), dtype=np.uint8))
+        self.assertIsNone(_read_png_size(not_png))
+
+    def test_validate_template(self):
+        """Test validate template theo kích thước."""
+        self.manager.add_template(self.source_path, 'export')
+        small_path = os.path.join(self.temp_dir, 'small.png')
+        cv2.imwrite(small_path, np.zeros((5, 5, 3), dtype=np.uint8))
+        self.manager.add_template(small_path, 'small')
+
+        valid = self.manager.validate_template('export')
+        small = self.manager.validate_template('small')
+
+        self.assertTrue(valid['readable'])
+        self.assertTrue(valid['valid_size'])
+        self.assertEqual((valid['width'], valid['height']), (40, 20))
+        self.assertFalse(small['valid_size'])
+        self.assertFalse(self.manager.validate_template('missing')['exists'])
+
+    def test_metadata_shared_between_instances(self):
+        """Test instance mới thấy metadata đã lưu bởi instance khác."""
+        self.manager.add_template(self.source_path, 'export', description='Nút export')
+
+        other = TemplateManager(self.manager.template_dir)
+        other.metadata.clear()
+
+        self.assertEqual(other.get_template('export').description, '')
+        third = TemplateManager(self.manager.template_dir)
+        self.assertEqual(third.get_template('export').description, 'Nút export')
+
+    def test_get_template_path_versions(self):
+        """Test tìm đường dẫn theo version, fallback về default."""
+        self.manager.add_template(self.source_path, 'export')
+        self.manager.add_template(self.source_path, 'export', version='v2')
+        buttons_dir = os.path.join(self.manager.template_dir, 'buttons')
+
+        self.assertEqual(
+            self.manager.get_template_path('export', version='v2'),
+            os.path.join(buttons_dir, 'export_v2.png')
+        )
+        self.assertEqual(
+            self.manager.get_template_path('export', version='v3'),
+            os.path.join(buttons_dir, 'export.png')
+        )
+
+        # File được thêm từ bên ngoài sau khi khởi tạo vẫn được tìm thấy
+        shutil.copy(self.source_path, os.path.join(buttons_dir, 'external.png'))
+        self.assertIsNotNone(self.manager.get_template_path('external'))
+        self.assertIsNone(self.manager.get_template_path('missing'))
+
+    def test_get_template_path_external_changes(self):
+        """Test version được thêm từ bên ngoài được ưu tiên, file bị xóa được bỏ khỏi index."""
+        self.manager.add_template(self.source_path, 'export')
+        buttons_dir = os.path.join(self.manager.template_dir, 'buttons')
+        default = os.path.join(buttons_dir, 'export.png')
+        versioned = os.path.join(buttons_dir, 'export_v2.png')
+
+        shutil.copy(self.source_path, versioned)
+        self.assertEqual(self.manager.get_template_path('export', version='v2'), versioned)
+
+        # Hit trong index không stat lại file
+        with mock.patch('os.path.exists') as exists:
+            self.assertEqual(self.manager.get_template_path('export', version='v2'), versioned)
+        exists.assert_not_called()
+
+        # File bị xóa từ bên ngoài: get_template bỏ entry cũ và fallback về default
+        os.remove(versioned)
+        self.assertEqual(self.manager.get_template('export', version='v2').path, default)
+        self.assertEqual(self.manager.get_template_path('export', version='v2'), default)
+
+        os.remove(default)
+        self.assertIsNone(self.manager.get_template('export'))
+        self.assertIsNone(self.manager.get_template_path('export'))
+
+    def test_get_template_path_miss_cached(self):
+        """Test lần không tìm thấy được nhớ đến khi hết TTL hoặc clear_cache."""
+        self.assertIsNone(self.manager.get_template_path('external'))
+
+        # File được thêm từ bên ngoài chưa được thấy trong TTL
+        shutil.copy(self.source_path, os.path.join(self.manager.template_dir, 'buttons', 'external.png'))
+        self.assertIsNone(self.manager.get_template_path('external'))
+
+        self.manager.clear_cache()
+        self.assertIsNotNone(self.manager.get_template_path('external'))
+
+        # add_template xóa các miss đã nhớ
+        self.assertIsNone(self.manager.get_template_path('new', version='v2'))
+        self.manager.add_template(self.source_path, 'new')
+        self.assertIsNotNone(self.manager.get_template_path('new', version='v2'))
+
+    def test_get_all_categories(self):
+        """Test bỏ qua thư mục ẩn và thư mục hệ thống."""
+        for folder in ('.git', '__pycache__', 'custom'):
+            os.makedirs(os.path.join(self.manager.template_dir, folder))
+
+        self.assertEqual(
+            self.manager.get_all_categories(),
+            ['buttons', 'custom', 'icons', 'status']
+        )
+
+    def test_cache_bounded(self):
+        """Test cache giữ tối đa CACHE_MAX_SIZE template, bỏ template ít dùng nhất."""
+        self.manager.CACHE_MAX_SIZE = 2
+        for name in ('a', 'b', 'c'):
+            self.manager.add_template(self.source_path, name)
+
+        first = self.manager.get_template('a')
+        self.manager.get_template('b')
+        self.assertIs(self.manager.get_template('a'), first)
+        self.manager.get_template('c')
+
+        self.assertEqual(
+            list(self.manager._cache),
+            [('buttons', 'a', 'default'), ('buttons', 'c', 'default')]
+        )
+
+    def test_get_template_load_image(self):
+        """Test decode và cache ảnh template theo ngân sách pixel."""
+        self.manager.add_template(self.source_path, 'a')
+        self.manager.add_template(self.source_path, 'b')
+        self.manager.IMAGE_CACHE_MAX_PIXELS = 40 * 20
+
+        a = self.manager.get_template('a', load_image=True)
+        self.assertEqual(a.image.shape, (20, 40, 3))
+        self.assertEqual(a.gray.shape, (20, 40))
+        self.assertNotIn('image', a.to_dict())
+        with self.assertRaises(AttributeError):
+            a.name = 'renamed'
+
+        # Ảnh của 'a' bị giải phóng khỏi cache để nhường chỗ cho 'b'
+        b = self.manager.get_template('b', load_image=True)
+        self.assertIsNotNone(b.image)
+        self.assertIsNone(self.manager.get_template('a').image)
+        self.assertEqual(self.manager._image_pixels, 40 * 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,14 +11,48 @@ Tests:
 import unittest
 import os
 import sys
+import time
 import tempfile
+from unittest import mock
 
 # Thêm thư mục gốc vào path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import pytest
+
+# Các test dùng ảnh giả cần cv2/numpy/mss; thiếu thì bỏ qua cả file thay vì lỗi
+cv2 = pytest.importorskip('cv2')
+np = pytest.importorskip('numpy')
+ScreenShot = pytest.importorskip('mss.screenshot').ScreenShot
+
 from services.vision_service import VisionService, MatchResult
 
 
+class _FakeScreen:
+    """Thay thế mss trong test: grab() trả về vùng của một ảnh BGR cố định."""
+
+    def __init__(self, image):
+        self.bgra = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+        h, w = image.shape[:2]
+        self.monitors = [{}, {'left': 0, 'top': 0, 'width': w, 'height': h}]
+
+    def grab(self, monitor):
+        x, y = monitor['left'], monitor['top']
+        region = self.bgra[y:y + monitor['height'], x:x + monitor['width']]
+        return ScreenShot(bytearray(region.tobytes()), monitor)
+
+    def close(self):
+        pass
+
+
+def _make_screen():
+    """Tạo ảnh màn hình giả có một hình chữ nhật dễ nhận diện."""
+    rng = np.random.RandomState(0)
+    image = rng.randint(0, 50, (120, 200, 3)).astype(np.uint8)
+    image[40:70, 100:150] = rng.randint(100, 255, (30, 50, 3))
+    return image
+
+
 class TestVisionService(unittest.TestCase):
     """Test cases cho VisionService."""
 
@@ -49,6 +83,14 @@ class TestVisionService(unittest.TestCase):
         for name, available in deps.items():
             print(f"  {name}: {'available' if available else 'NOT available'}")
 
+    def test_lazy_import(self):
+        """Test module tùy chọn chỉ import khi dùng và cache kết quả."""
+        from services import vision_service
+
+        self.assertIs(vision_service._lazy_import('json'), sys.modules['json'])
+        self.assertIsNone(vision_service._lazy_import('_missing_vision_module'))
+        self.assertIn('_missing_vision_module', vision_service._LAZY_MODULES)
+
     def test_capture_screenshot(self):
         """Test capture screenshot."""
         # Chỉ test nếu có opencv và mss
@@ -96,6 +138,276 @@ class TestVisionService(unittest.TestCase):
         self.assertIsInstance(result, MatchResult)
         self.assertFalse(result.found)
 
+    def test_close_reusable(self):
+        """Test close() an toàn khi chưa chụp và có thể gọi nhiều lần."""
+        self.vision.close()
+        self.vision.close()
+        self.assertIsNone(self.vision._sct)
+
+    def test_context_manager_closes(self):
+        """Test with VisionService(...) đóng backend chụp khi ra khỏi with."""
+        screen = _FakeScreen(_make_screen())
+        screen.close = mock.Mock()
+
+        with VisionService(screenshot_on_error=False) as vision:
+            vision._sct = screen
+            self.assertIsNotNone(vision.capture_screenshot())
+
+        screen.close.assert_called_once()
+        self.assertIsNone(vision._sct)
+
+    def test_capture_from_buffer(self):
+        """Test chuyển buffer BGRA của mss sang BGR và grayscale."""
+        image = _make_screen()
+        self.vision._sct = _FakeScreen(image)
+
+        bgr = self.vision.capture_screenshot((100, 40, 50, 30))
+        gray = self.vision._capture_gray()
+
+        np.testing.assert_array_equal(bgr, image[40:70, 100:150])
+        np.testing.assert_array_equal(gray, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+
+    def test_capture_dxcam_backend(self):
+        """Test cắt vùng từ frame DXcam và chuyển sang mss khi DXcam lỗi."""
+        image = _make_screen()
+        bgra = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+        self.vision._capture_backend = 'dxcam'
+        self.vision._cam = mock.Mock(get_latest_frame=mock.Mock(return_value=bgra))
+
+        np.testing.assert_array_equal(
+            self.vision.capture_screenshot((100, 40, 50, 30)), image[40:70, 100:150]
+        )
+
+        self.vision._cam.get_latest_frame.side_effect = RuntimeError('lost device')
+        self.vision._sct = _FakeScreen(image)
+        np.testing.assert_array_equal(self.vision.capture_screenshot(), image)
+        self.assertEqual(self.vision._capture_backend, 'mss')
+        self.assertIsNone(self.vision._cam)
+
+    def test_capture_reuses_buffers(self):
+        """Test dùng lại buffer khi chụp cùng kích thước."""
+        image = _make_screen()
+        self.vision._sct = _FakeScreen(image)
+
+        first = self.vision._capture_gray((0, 0, 50, 30))
+        second = self.vision._capture_gray((100, 40, 50, 30))
+        self.assertIs(first, second)
+
+        out = np.empty((30, 50, 3), dtype=np.uint8)
+        self.assertIs(self.vision.capture_screenshot((100, 40, 50, 30), out=out), out)
+        np.testing.assert_array_equal(out, image[40:70, 100:150])
+
+    def test_load_template_cached(self):
+        """Test template được cache đến khi file thay đổi."""
+        path = os.path.join(self.temp_dir, 'cached.png')
+        cv2.imwrite(path, np.zeros((10, 20, 3), dtype=np.uint8))
+
+        first = self.vision.load_template(path)
+        self.assertIs(self.vision.load_template(path), first)
+        self.assertIs(self.vision._load_template_gray(path), self.vision._load_template_gray(path))
+        self.assertFalse(first.flags.writeable)
+
+        cv2.imwrite(path, np.zeros((12, 20, 3), dtype=np.uint8))
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        self.assertEqual(self.vision.load_template(path).shape, (12, 20, 3))
+
+    def test_find_image_on_screen(self):
+        """Test tìm template trên màn hình giả."""
+        image = _make_screen()
+        self.vision._sct = _FakeScreen(image)
+        path = os.path.join(self.temp_dir, 'patch.png')
+        cv2.imwrite(path, image[40:70, 100:150])
+
+        result = self.vision.find_image_on_screen(path)
+        color = self.vision.find_image_on_screen(path, grayscale=False)
+        in_region = self.vision.find_image_on_screen(path, region=(80, 20, 100, 80))
+
+        self.assertTrue(result.found)
+        self.assertEqual((result.x, result.y), (125, 55))
+        self.assertEqual((color.x, color.y), (125, 55))
+        self.assertEqual((in_region.x, in_region.y), (125, 55))
+
+    def test_match_template_opencl(self):
+        """Test matching qua UMat cho cùng kết quả với CPU."""
+        image = cv2.cvtColor(_make_screen(), cv2.COLOR_BGR2GRAY)
+        template = image[40:70, 100:150].copy()
+        expected = self.vision._match_template(image, template)
+
+        self.vision.use_gpu = True
+        result = self.vision._match_template(image, template)
+        self.vision._match_template(image, template)
+
+        self.assertEqual(cv2.minMaxLoc(result)[3], cv2.minMaxLoc(expected)[3])
+        self.assertEqual(len(self.vision._umats), 1)
+
+    def test_find_any_of(self):
+        """Test tìm nhiều template trên cùng một ảnh chụp."""
+        image = _make_screen()
+        self.vision._sct = _FakeScreen(image)
+        present = os.path.join(self.temp_dir, 'present.png')
+        cv2.imwrite(present, image[40:70, 100:150])
+
+        results = self.vision.find_any_of([present, 'nonexistent.png', present])
+
+        self.assertEqual([r.found for r in results], [True, False, True])
+        self.assertEqual((results[0].x, results[0].y), (125, 55))
+
+    def test_find_image_multi_scale(self):
+        """Test matching coarse-to-fine cho cùng kết quả với matching toàn ảnh."""
+        rng = np.random.RandomState(1)
+        noise = rng.randint(0, 255, (300, 400)).astype(np.uint8)
+        image = cv2.cvtColor(cv2.GaussianBlur(noise, (0, 0), 3), cv2.COLOR_GRAY2BGR)
+        self.vision._sct = _FakeScreen(image)
+        path = os.path.join(self.temp_dir, 'large_patch.png')
+        cv2.imwrite(path, image[143:183, 201:261])
+
+        coarse = self.vision.find_image_on_screen(path, confidence=0.5)
+        full = self.vision.find_image_on_screen(path, confidence=0.5, multi_scale=False)
+
+        self.assertTrue(coarse.found)
+        self.assertEqual((coarse.x, coarse.y), (231, 163))
+        self.assertEqual((coarse.x, coarse.y), (full.x, full.y))
+
+    def test_multi_scale_finds_exact_crops(self):
+        """Test template cắt nguyên từ ảnh (nhiều chi tiết nhỏ) luôn được tìm thấy."""
+        rng = np.random.RandomState(2)
+        screen = rng.randint(0, 255, (240, 320)).astype(np.uint8)
+
+        for _ in range(60):
+            x, y = rng.randint(0, 280), rng.randint(0, 200)
+            template = screen[y:y + 40, x:x + 40]
+
+            result = self.vision._locate(screen, template, 0.9)
+
+            self.assertTrue(result.found)
+            self.assertEqual((result.x, result.y), (x + 20, y + 20))
+
+    def test_find_all_images_on_screen(self):
+        """Test tìm tất cả vị trí, mỗi lần xuất hiện chỉ một kết quả."""
+        image = _make_screen()
+        image[80:110, 10:60] = image[40:70, 100:150]
+        self.vision._sct = _FakeScreen(image)
+        path = os.path.join(self.temp_dir, 'repeated.png')
+        cv2.imwrite(path, image[40:70, 100:150])
+
+        matches = self.vision.find_all_images_on_screen(path, confidence=0.6)
+        raw = self.vision.find_all_images_on_screen(
+            path, confidence=0.6, non_max_suppression=False
+        )
+
+        self.assertEqual(
+            sorted((m.x, m.y) for m in matches if m.confidence > 0.99),
+            [(35, 95), (125, 55)]
+        )
+        self.assertEqual(len(matches), 2)
+        self.assertGreaterEqual(len(raw), len(matches))
+
+        best = MatchResult.from_record(matches[np.argmax(matches.confidence)])
+        self.assertIsInstance(best, MatchResult)
+        self.assertTrue(best.found)
+        self.assertEqual((best.width, best.height), (50, 30))
+
+    def test_find_all_images_empty_is_recarray(self):
+        """Test không tìm thấy (hoặc thiếu OpenCV) vẫn trả về recarray rỗng cùng dtype."""
+        missing = self.vision.find_all_images_on_screen(
+            os.path.join(self.temp_dir, 'missing.png')
+        )
+        with mock.patch('services.vision_service.CV2_AVAILABLE', False):
+            no_cv2 = self.vision.find_all_images_on_screen('any.png')
+
+        for results in (missing, no_cv2):
+            self.assertIsInstance(results, np.recarray)
+            self.assertEqual(results.size, 0)
+            self.assertEqual(results.dtype.names, missing.dtype.names)
+
+    def test_wait_for_image_backoff(self):
+        """Test poll giãn dần khi chưa thấy và dừng đúng timeout."""
+        path = os.path.join(self.temp_dir, 'wait.png')
+        cv2.imwrite(path, np.zeros((4, 4, 3), dtype=np.uint8))
+        calls = []
+
+        def fake_capture(region=None):
+            # Mỗi lần chụp là một frame khác
+            return np.full((8, 8), len(calls), dtype=np.uint8)
+
+        def fake_locate(screenshot, template, confidence, region=None, multi_scale=True):
+            calls.append(time.monotonic())
+            return MatchResult(found=len(calls) == 6)
+
+        self.vision._capture_gray = fake_capture
+        self.vision._locate = fake_locate
+
+        result = self.vision.wait_for_image(path, timeout=5, check_interval=0.5)
+        self.assertTrue(result.found)
+        gaps = [b - a for a, b in zip(calls, calls[1:])]
+        self.assertLess(gaps[0], 0.2)
+        self.assertGreater(gaps[-1], gaps[0])
+
+        self.vision._locate = lambda *args, **kwargs: MatchResult(found=False)
+        start = time.monotonic()
+        self.assertFalse(self.vision.wait_for_image(path, timeout=0.3).found)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_wait_for_image_skips_unchanged_frames(self):
+        """Test không match lại khi màn hình không đổi."""
+        image = _make_screen()
+        self.vision._sct = _FakeScreen(image)
+        path = os.path.join(self.temp_dir, 'absent.png')
+        cv2.imwrite(path, np.random.RandomState(5).randint(0, 255, (20, 20, 3)).astype(np.uint8))
+
+        locate = self.vision._locate
+        calls = []
+
+        def counting_locate(*args, **kwargs):
+            calls.append(1)
+            return locate(*args, **kwargs)
+
+        self.vision._locate = counting_locate
+
+        self.assertFalse(self.vision.wait_for_image(path, timeout=0.3).found)
+        self.assertEqual(len(calls), 1)
+
+    def test_preprocess_ocr(self):
+        """Test nhị phân hóa ảnh OCR về chữ tối trên nền sáng, phóng to 2x."""
+        dark_theme = np.full((10, 30), 30, dtype=np.uint8)
+        dark_theme[3:7, 5:25] = 220
+
+        binary = VisionService._preprocess_ocr(dark_theme)
+
+        self.assertEqual(binary.shape, (20, 60))
+        self.assertEqual(binary[0, 0], 255)
+        self.assertEqual(binary[10, 20], 0)
+        self.assertEqual(set(np.unique(binary)), {0, 255})
+
+    def test_read_text_region_passes_array(self):
+        """Test OCR nhận thẳng ndarray grayscale, không qua PIL."""
+        deps = VisionService.check_dependencies()
+        if not deps['pytesseract'] or deps['tesserocr']:
+            self.skipTest("pytesseract backend not in use")
+
+        self.vision._sct = _FakeScreen(_make_screen())
+        with mock.patch('pytesseract.image_to_string', return_value=' Done \n') as ocr:
+            text = self.vision.read_text_region(100, 40, 50, 30, single_line=True)
+
+        self.assertEqual(text, 'Done')
+        image = ocr.call_args[0][0]
+        self.assertIsInstance(image, np.ndarray)
+        self.assertEqual(image.shape, (60, 100))
+        self.assertIn('--psm 7', ocr.call_args[1]['config'])
+
+    def test_wait_for_text_skips_unchanged_region(self):
+        """Test không OCR lại khi vùng màn hình không đổi."""
+        deps = VisionService.check_dependencies()
+        if not deps['pytesseract'] and not deps['tesserocr']:
+            self.skipTest("OCR backend not available")
+
+        self.vision._sct = _FakeScreen(_make_screen())
+        with mock.patch.object(self.vision, '_ocr', return_value='Exporting') as ocr:
+            found = self.vision.wait_for_text(0, 0, 50, 30, 'Done', timeout=0.3)
+
+        self.assertFalse(found)
+        self.assertEqual(ocr.call_count, 1)
+
     def test_match_result_dataclass(self):
         """Test MatchResult dataclass."""
         result = MatchResult(
@@ -9,8 +9,15 @@ Module này cung cấp:
 """
 
 import os
+import time
+import queue
+import random
+import atexit
+import asyncio
+import inspect
 import traceback
 import logging
+import logging.handlers
 from typing import Optional, Callable, Any, Dict
 from datetime import datetime
 from enum import Enum
@@ -65,6 +72,31 @@ class ErrorInfo:
         }
 
 
+class CachedPrefixFormatter(logging.Formatter):
+    """
+    Formatter cache phần thời gian theo giây.
+
+    time.strftime chỉ chạy lại khi sang giây mới; phần mili giây được ghép
+    thêm cho từng record (cùng định dạng với logging.Formatter mặc định).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_sec: Optional[int] = None
+        self._cached_str = ''
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format thời gian của record, dùng lại chuỗi giây đã format."""
+        if datefmt:
+            return super().formatTime(record, datefmt)
+
+        sec = int(record.created)
+        if sec != self._cached_sec:
+            self._cached_str = time.strftime(self.default_time_format, self.converter(sec))
+            self._cached_sec = sec
+        return self.default_msec_format % (self._cached_str, record.msecs)
+
+
 class ErrorHandler:
     """
     Xử lý lỗi thông minh với screenshots và retry.
@@ -76,6 +108,9 @@ class ErrorHandler:
     - Notification cho user
     """
 
+    # Số record giữ trong bộ đệm trước khi ghi xuống file
+    LOG_BUFFER_CAPACITY = 512
+
     def __init__(
         self,
         screenshot_on_error: bool = True,
@@ -124,6 +159,16 @@ class ErrorHandler:
         self.logger = logging.getLogger('ErrorHandler')
         self.logger.setLevel(logging.DEBUG)
 
+        # Logger dùng chung giữa các instance: nếu đã có instance dựng
+        # queue/listener thì dùng lại, không thêm handler (tránh ghi log trùng),
+        # thread hay atexit hook mới. Chỉ instance dựng listener mới đóng nó.
+        self._listener = None
+        if any(
+            isinstance(handler, logging.handlers.QueueHandler)
+            for handler in self.logger.handlers
+        ):
+            return
+
         # File handler
         fh = logging.FileHandler(log_file, encoding='utf-8')
         fh.setLevel(logging.DEBUG)
@@ -133,15 +178,51 @@ class ErrorHandler:
         ch.setLevel(logging.WARNING)
 
         # Formatter
-        formatter = logging.Formatter(
+        formatter = CachedPrefixFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
 
-        # Add handlers
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
+        # Gom record vào bộ đệm rồi ghi file một lần thay vì ghi từng dòng;
+        # từ ERROR trở lên ghi ngay
+        mh = logging.handlers.MemoryHandler(
+            self.LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=fh
+        )
+        self._log_handlers = (mh, fh, ch)
+
+        # Logger chỉ đẩy record vào queue; ghi file/console chạy ở thread
+        # riêng của QueueListener, không chặn thread gọi handle_error
+        self._log_queue = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(self._log_queue)
+        self.logger.addHandler(self._queue_handler)
+
+        self._listener = logging.handlers.QueueListener(
+            self._log_queue, mh, ch, respect_handler_level=True
+        )
+        self._listener.start()
+
+        # Ghi nốt log còn trong queue/bộ đệm khi thoát chương trình
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """
+        Dừng thread ghi log, ghi nốt các record còn lại và đóng file log.
+
+        Không làm gì với instance dùng lại logging của instance khác.
+        """
+        if self._listener is None:
+            return
+
+        self.logger.removeHandler(self._queue_handler)
+        self._listener.stop()
+        self._listener = None
+
+        # MemoryHandler đóng trước để flush bộ đệm xuống file handler
+        for handler in self._log_handlers:
+            handler.close()
+
+        atexit.unregister(self.close)
 
     def handle_error(
         self,
@@ -209,14 +290,15 @@ class ErrorHandler:
             # Import vision service để chụp màn hình
             from services.vision_service import VisionService
 
-            vision = VisionService(screenshot_dir=self.screenshot_dir)
-
             # Tạo tên file
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"error_{timestamp}_{self.error_count}.png"
 
-            # Chụp màn hình
-            if vision.save_screenshot(filename):
+            # Chụp màn hình; with đóng backend chụp (mss/DXcam) ngay sau khi dùng
+            with VisionService(screenshot_dir=self.screenshot_dir) as vision:
+                saved = vision.save_screenshot(filename)
+
+            if saved:
                 screenshot_path = os.path.join(self.screenshot_dir, filename)
                 self.logger.info(f"Đã chụp screenshot: {screenshot_path}")
                 return screenshot_path
@@ -241,20 +323,26 @@ class ErrorHandler:
             ErrorSeverity.CRITICAL: logging.CRITICAL
         }.get(error_info.severity, logging.ERROR)
 
-        # Log message
-        log_message = f"{error_info.message}"
-        if error_info.exception:
-            log_message += f" - Exception: {error_info.exception}"
-        if error_info.context:
-            log_message += f" - Context: {error_info.context}"
-        if error_info.screenshot_path:
-            log_message += f" - Screenshot: {error_info.screenshot_path}"
-
-        self.logger.log(log_level, log_message)
+        # Chỉ dựng message khi level được bật; format lười qua args của logging
+        # để str() exception/context chỉ chạy khi record thực sự được ghi
+        if self.logger.isEnabledFor(log_level):
+            log_format = "%s"
+            args = [error_info.message]
+            if error_info.exception:
+                log_format += " - Exception: %s"
+                args.append(error_info.exception)
+            if error_info.context:
+                log_format += " - Context: %s"
+                args.append(error_info.context)
+            if error_info.screenshot_path:
+                log_format += " - Screenshot: %s"
+                args.append(error_info.screenshot_path)
+
+            self.logger.log(log_level, log_format, *args)
 
         # Log stack trace nếu có
-        if error_info.stack_trace:
-            self.logger.debug(f"Stack trace:\n{error_info.stack_trace}")
+        if error_info.stack_trace and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Stack trace:\n%s", error_info.stack_trace)
 
     def retry_with_backoff(
         self,
@@ -263,7 +351,9 @@ class ErrorHandler:
         initial_delay: float = 1.0,
         backoff_factor: float = 2.0,
         exceptions: tuple = (Exception,),
-        on_retry: Optional[Callable[[int, Exception], None]] = None
+        on_retry: Optional[Callable[[int, Exception], None]] = None,
+        jitter: str = 'full',
+        max_delay: float = 60.0
     ) -> Any:
         """
         Thử lại function với exponential backoff.
@@ -275,6 +365,9 @@ class ErrorHandler:
             backoff_factor: Hệ số nhân cho mỗi lần retry
             exceptions: Tuple các exception cần retry
             on_retry: Callback khi retry (attempt_number, exception)
+            jitter: 'full' = chờ ngẫu nhiên trong [0, delay] để các caller lỗi
+                cùng lúc không retry đồng loạt; 'none' = đúng exponential
+            max_delay: Thời gian chờ tối đa (giây)
 
         Returns:
             Kết quả của function
@@ -282,10 +375,7 @@ class ErrorHandler:
         Raises:
             Exception cuối cùng nếu thất bại tất cả các lần thử
         """
-        import time
-
         last_exception = None
-        delay = initial_delay
 
         for attempt in range(1, max_attempts + 1):
             try:
@@ -293,26 +383,124 @@ class ErrorHandler:
 
             except exceptions as e:
                 last_exception = e
-
-                # Log retry
-                self.logger.warning(
-                    f"Attempt {attempt}/{max_attempts} failed: {e}. "
-                    f"Retrying in {delay}s..."
+                delay = self._next_delay(
+                    attempt, initial_delay, backoff_factor, max_delay, jitter
                 )
-
-                # Callback nếu có
-                if on_retry:
-                    try:
-                        on_retry(attempt, e)
-                    except Exception as callback_error:
-                        self.logger.error(f"Lỗi on_retry callback: {callback_error}")
+                self._on_attempt_failed(attempt, max_attempts, e, delay, on_retry)
 
                 # Chờ trước khi retry (trừ lần cuối)
                 if attempt < max_attempts:
                     time.sleep(delay)
-                    delay *= backoff_factor
 
-        # Tất cả các lần thử đều thất bại
+        self._raise_retry_exhausted(func, max_attempts, last_exception)
+
+    async def aretry_with_backoff(
+        self,
+        func: Callable,
+        max_attempts: int = 3,
+        initial_delay: float = 1.0,
+        backoff_factor: float = 2.0,
+        exceptions: tuple = (Exception,),
+        on_retry: Optional[Callable[[int, Exception], None]] = None,
+        jitter: str = 'full',
+        max_delay: float = 60.0
+    ) -> Any:
+        """
+        Bản async của retry_with_backoff: chờ bằng asyncio.sleep nên không
+        chặn event loop giữa các lần thử.
+
+        Args:
+            func: Function hoặc coroutine function cần thực thi
+            max_attempts: Số lần thử tối đa
+            initial_delay: Thời gian chờ ban đầu (giây)
+            backoff_factor: Hệ số nhân cho mỗi lần retry
+            exceptions: Tuple các exception cần retry
+            on_retry: Callback khi retry (attempt_number, exception)
+            jitter: 'full' = chờ ngẫu nhiên trong [0, delay] để các caller lỗi
+                cùng lúc không retry đồng loạt; 'none' = đúng exponential
+            max_delay: Thời gian chờ tối đa (giây)
+
+        Returns:
+            Kết quả của function
+
+        Raises:
+            Exception cuối cùng nếu thất bại tất cả các lần thử
+        """
+        last_exception = None
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                result = func()
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+            except exceptions as e:
+                last_exception = e
+                delay = self._next_delay(
+                    attempt, initial_delay, backoff_factor, max_delay, jitter
+                )
+                self._on_attempt_failed(attempt, max_attempts, e, delay, on_retry)
+
+                # Chờ trước khi retry (trừ lần cuối)
+                if attempt < max_attempts:
+                    await asyncio.sleep(delay)
+
+        self._raise_retry_exhausted(func, max_attempts, last_exception)
+
+    @staticmethod
+    def _next_delay(
+        attempt: int,
+        initial_delay: float,
+        backoff_factor: float,
+        max_delay: float = 60.0,
+        jitter: str = 'none'
+    ) -> float:
+        """
+        Tính thời gian chờ sau lần thử thứ attempt (bắt đầu từ 1).
+
+        Args:
+            attempt: Số thứ tự lần thử vừa thất bại
+            initial_delay: Thời gian chờ ban đầu (giây)
+            backoff_factor: Hệ số nhân cho mỗi lần retry
+            max_delay: Thời gian chờ tối đa (giây)
+            jitter: 'full' = ngẫu nhiên trong [0, delay], 'none' = giữ nguyên
+
+        Returns:
+            Thời gian chờ (giây)
+        """
+        delay = min(max_delay, initial_delay * backoff_factor ** (attempt - 1))
+        if jitter == 'full':
+            return random.uniform(0, delay)
+        return delay
+
+    def _on_attempt_failed(
+        self,
+        attempt: int,
+        max_attempts: int,
+        exception: Exception,
+        delay: float,
+        on_retry: Optional[Callable[[int, Exception], None]]
+    ) -> None:
+        """Log lần thử thất bại và gọi callback on_retry (nếu có)."""
+        self.logger.warning(
+            "Attempt %d/%d failed: %s. Retrying in %.2fs...",
+            attempt, max_attempts, exception, delay
+        )
+
+        if on_retry:
+            try:
+                on_retry(attempt, exception)
+            except Exception as callback_error:
+                self.logger.error(f"Lỗi on_retry callback: {callback_error}")
+
+    def _raise_retry_exhausted(
+        self,
+        func: Callable,
+        max_attempts: int,
+        last_exception: Exception
+    ) -> None:
+        """Ghi nhận lỗi khi tất cả các lần thử đều thất bại rồi raise lại exception cuối."""
         self.handle_error(
             last_exception,
             f"Function thất bại sau {max_attempts} lần thử",
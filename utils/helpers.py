@@ -5,10 +5,20 @@ Module này chứa các hàm helper được sử dụng xuyên suốt ứng d
 """
 
 import os
+import re
+import mmap
 import json
 import platform
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional, Any, Tuple
+from typing import Optional, Any, Tuple, Sequence
+
+# orjson (tùy chọn): parse JSON nhanh hơn nhiều so với module json chuẩn
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 def format_datetime(dt: Optional[datetime], format_str: str = "%d/%m/%Y %H:%M") -> str:
@@ -87,6 +97,43 @@ def validate_path(path: str, is_file: bool = True) -> bool:
     return os.path.isdir(path)
 
 
+def loads_json(data: bytes) -> Any:
+    """
+    Parse JSON từ bytes, dùng orjson nếu có.
+
+    Đọc file ở chế độ binary rồi parse trực tiếp bytes giúp bỏ qua
+    bước decode sang str.
+
+    Args:
+        data: Nội dung JSON (UTF-8)
+
+    Returns:
+        Dữ liệu đã parse
+
+    Raises:
+        json.JSONDecodeError: Nếu JSON không hợp lệ
+            (orjson.JSONDecodeError là lớp con của nó)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serialize dữ liệu thành JSON dạng gọn (UTF-8), dùng orjson nếu có.
+
+    Args:
+        data: Dữ liệu cần serialize
+
+    Returns:
+        Nội dung JSON dạng bytes
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
 def safe_json_load(filepath: str, default: Any = None) -> Any:
     """
     Đọc file JSON một cách an toàn.
@@ -103,8 +150,8 @@ def safe_json_load(filepath: str, default: Any = None) -> Any:
 
     try:
         if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                return loads_json(f.read())
     except (json.JSONDecodeError, OSError) as e:
         print(f"Lỗi đọc file JSON {filepath}: {e}")
 
@@ -137,6 +184,59 @@ def safe_json_save(filepath: str, data: Any, indent: int = 4) -> bool:
         return False
 
 
+@lru_cache(maxsize=32)
+def _flag_pattern(keys: Tuple[str, ...]) -> 're.Pattern':
+    """
+    Regex tìm `"key": true` (hoặc số khác 0) cho bộ key, compile một lần.
+
+    Args:
+        keys: Các key cần kiểm tra
+
+    Returns:
+        Pattern đã compile (trên bytes)
+    """
+    return re.compile(
+        rb'"(?:' + b'|'.join(re.escape(k.encode('utf-8')) for k in keys)
+        + rb')"\s*:\s*(?:true|[1-9])'
+    )
+
+
+def probe_json_flag(filepath: str, keys: Sequence[str]) -> bool:
+    """
+    Kiểm tra một trong các key cấp đầu của file JSON có giá trị truthy không.
+
+    Tìm trước trên bytes thô dạng `"key": true` (hoặc số khác 0) qua mmap,
+    không phải copy nội dung file vào bộ nhớ. Chỉ khi tìm thấy mới parse
+    JSON để xác nhận key nằm ở cấp đầu, nên trường hợp phổ biến (cờ không
+    bật) không phải đọc hay parse file.
+
+    Args:
+        filepath: Đường dẫn đến file JSON
+        keys: Các key cần kiểm tra
+
+    Returns:
+        True nếu có key mang giá trị truthy, False nếu không hoặc đọc lỗi
+    """
+    pattern = _flag_pattern(tuple(keys))
+
+    try:
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if pattern.search(mm) is None:
+                    return False
+                raw = mm[:]
+    except (OSError, ValueError):
+        # ValueError: file rỗng, không thể mmap
+        return False
+
+    try:
+        data = loads_json(raw)
+    except ValueError:
+        return False
+
+    return isinstance(data, dict) and any(data.get(k) for k in keys)
+
+
 def is_windows() -> bool:
     """
     Kiểm tra có đang chạy trên Windows không.